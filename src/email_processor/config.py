@@ -58,6 +58,10 @@ class Settings(BaseSettings):
         default=True,
         description="Use TLS for SMTP connection",
     )
+    smtp_use_ssl: bool = Field(
+        default=False,
+        description="Connect with implicit TLS (SMTPS, port 465) instead of STARTTLS",
+    )
 
     # Google AI Configuration
     google_api_key: SecretStr = Field(
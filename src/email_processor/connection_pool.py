@@ -0,0 +1,87 @@
+"""
+Idle connection pooling for the IMAP and SMTP clients.
+
+Provides the bookkeeping shared by IMAPPool and SMTPPool: idle connections
+per account, a cap on how many are kept, and a liveness check before reuse.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+from email_processor.config import Settings
+
+logger = logging.getLogger(__name__)
+
+Connection = TypeVar("Connection")
+
+
+class ConnectionPool(Generic[Connection]):
+    """
+    Pool of authenticated connections, reused across client connect() calls.
+
+    Idle connections are kept per key (server, port and account) with the
+    time they were released. On acquire, a connection idle for longer than
+    idle_timeout is closed, and any other is reused only if it passes
+    _is_alive(). Subclasses supply how a connection is keyed, opened,
+    checked and closed.
+    """
+
+    def __init__(self, max_idle: int = 4, idle_timeout: Optional[float] = None):
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self._idle: Dict[Hashable, List[Tuple[Connection, float]]] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, settings: Settings) -> Hashable:
+        raise NotImplementedError
+
+    def _open(self, settings: Settings) -> Connection:
+        raise NotImplementedError
+
+    def _is_alive(self, connection: Connection) -> bool:
+        raise NotImplementedError
+
+    def _close(self, connection: Connection) -> None:
+        raise NotImplementedError
+
+    def _on_idle(self) -> None:
+        """Called with the lock held whenever a connection is added to the idle lists."""
+
+    def acquire(self, settings: Settings) -> Connection:
+        """Take an idle live connection for this account, or open a new one."""
+        key = self._key(settings)
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                if not idle:
+                    break
+                connection, released_at = idle.pop()
+            if self.idle_timeout is not None and time.monotonic() - released_at > self.idle_timeout:
+                self._close(connection)
+                continue
+            if self._is_alive(connection):
+                return connection
+            logger.info("Dropping dead pooled connection")
+            self._close(connection)
+        return self._open(settings)
+
+    def release(self, settings: Settings, connection: Connection, reusable: bool = True) -> None:
+        """Return a connection to the pool, or close it if it cannot be reused."""
+        if reusable:
+            with self._lock:
+                idle = self._idle.setdefault(self._key(settings), [])
+                if len(idle) < self.max_idle:
+                    idle.append((connection, time.monotonic()))
+                    self._on_idle()
+                    return
+        self._close(connection)
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection, _ in connections:
+                self._close(connection)
@@ -4,12 +4,187 @@ Simple Email Template Renderer.
 Renders professional HTML emails using simple string templates.
 """
 
+import functools
 import logging
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from html import escape
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, NamedTuple, Optional, TextIO, Union
 
 logger = logging.getLogger(__name__)
 
+# Default to project root /templates directory
+_DEFAULT_TEMPLATES_DIR = Path(__file__).resolve().parent.parent.parent / "templates"
+
+# Matches {{PLACEHOLDER}} slots in template files
+_PLACEHOLDER_RE = re.compile(r'\{\{(\w+)\}\}')
+
+# A compiled template: literal segments and the placeholder names between them
+_CompiledTemplate = tuple[List[str], List[str]]
+
+# Compiled templates shared by all renderers, keyed by template path.
+# Like a template engine with auto-reload off, files are read once per process.
+_template_cache: Dict[Path, _CompiledTemplate] = {}
+
+
+# Read-only, not inherited by child processes; O_BINARY only exists on Windows
+_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0)
+
+
+def _read_file(path: Path) -> bytes:
+    """Read a whole file with raw os.read() calls, skipping the buffered io layer."""
+    fd = os.open(path, _OPEN_FLAGS)
+    try:
+        chunks = []
+        while chunk := os.read(fd, 65536):
+            chunks.append(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+
+def _compile_template(text: str) -> _CompiledTemplate:
+    """Split template text into literal segments and placeholder names."""
+    parts = _PLACEHOLDER_RE.split(text)
+    return parts[0::2], parts[1::2]
+
+
+# HTML skeletons for the optional email sections, filled with str.format
+_DISC_SECTION = """
+        <div class="section-title">
+            📋 Found Discrepancies
+        </div>
+
+        <div class="discrepancy-list">{items}
+        </div>"""
+
+_KEY_POINTS_SECTION = """
+        <div class="section-title">
+            🔑 {title}
+        </div>
+
+        <div class="key-points">
+            <ul>
+                {items}
+            </ul>
+        </div>"""
+
+_CTA_BLOCK = """
+        <div class="cta">
+            <a href="mailto:{reply_to}" class="cta-button">{text}</a>
+        </div>"""
+
+_WARNING_BLOCK = """
+        <div class="warning">
+            <div class="warning-icon">⚠️</div>
+            <div>{message}</div>
+        </div>"""
+
+_HIGHLIGHT_BLOCK = """
+        <div class="highlight-box">
+            <strong>{title}</strong><br>
+            {message}
+        </div>"""
+
+_INFO_BOX = """
+        <div class="info-box">
+            <div class="info-box-title">{title}</div>
+            <div>{message}</div>
+        </div>"""
+
+_FOLLOWUP_BLOCK = """
+            <p>{message}</p>"""
+
+# Plain text counterparts of the optional sections
+_DISC_SECTION_TXT = "\n\nFOUND DISCREPANCIES:\n\n" + "-" * 50 + "{items}\n\n"
+_KEY_POINTS_SECTION_TXT = "\n\nKEY DETAILS:\n{items}\n\n"
+_HIGHLIGHT_BLOCK_TXT = "\n\n{title}:\n{message}\n"
+_CLOSING_BLOCK_TXT = "\n\n{message}\n"
+
+# Literal fragments around each discrepancy item
+_DISC_OPEN = '\n            <div class="disc-item">\n                <strong>'
+_DISC_MID = '</strong>\n                '
+_DISC_CLOSE = '\n            </div>'
+
+
+@functools.lru_cache(maxsize=128)
+def _cta_html(reply_to_email: str, cta_text: Optional[str]) -> str:
+    """Build the call-to-action button, or "" when there is no button text."""
+    if not cta_text:
+        return ""
+    return _CTA_BLOCK.format(reply_to=escape(str(reply_to_email)), text=escape(str(cta_text)))
+
+
+@functools.lru_cache(maxsize=128)
+def _warning_html(warning_message: Optional[str]) -> str:
+    """Build the warning box, or "" when there is no warning."""
+    if not warning_message:
+        return ""
+    return _WARNING_BLOCK.format(message=escape(str(warning_message)))
+
+
+@functools.lru_cache(maxsize=128)
+def _highlight_html(highlight_title: str, highlight_message: Optional[str]) -> str:
+    """Build the highlight box, or "" when there is no message."""
+    if not highlight_message:
+        return ""
+    return _HIGHLIGHT_BLOCK.format(title=escape(str(highlight_title)), message=escape(str(highlight_message)))
+
+
+@functools.lru_cache(maxsize=1)
+def _minute_stamp(minute: int) -> str:
+    """Format a timestamp given in minutes since the epoch (local time)."""
+    return datetime.fromtimestamp(minute * 60).strftime('%Y-%m-%d %H:%M')
+
+
+@dataclass(frozen=True, slots=True)
+class DiscrepancyRecord:
+    """A single discrepancy shown in a discrepancy email."""
+    title: str
+    details: str = ""
+
+
+class RenderedEmail(NamedTuple):
+    """The HTML and plain text bodies of a rendered email."""
+    html: str
+    plain: str
+
+
+def _discrepancy_records(
+    discrepancies: Optional[list[Union[Dict[str, str], DiscrepancyRecord]]]
+) -> tuple[DiscrepancyRecord, ...]:
+    """Convert discrepancy dicts to records once; records pass through as-is."""
+    records = []
+    append = records.append
+    for disc in discrepancies or ():
+        if isinstance(disc, DiscrepancyRecord):
+            append(disc)
+            continue
+        disc_get = disc.get
+        append(DiscrepancyRecord(disc_get('title') or disc_get('type', ''), disc_get('details', '')))
+    return tuple(records)
+
+
+# Renderer used inside render_many() worker processes
+_worker_renderer: Optional["EmailTemplateRenderer"] = None
+
+
+def _init_render_worker(renderer: "EmailTemplateRenderer") -> None:
+    """Install the parent's renderer (and its loaded templates) in a worker."""
+    global _worker_renderer
+    _worker_renderer = renderer
+
+
+def _render_one(job: tuple[str, Dict[str, Any]]) -> RenderedEmail:
+    """Render a single (kind, params) job in a worker process."""
+    kind, params = job
+    return getattr(_worker_renderer, f"render_{kind}_email")(**params)
+
 
 class EmailTemplateRenderer:
     """
@@ -18,6 +193,15 @@ class EmailTemplateRenderer:
     Renders HTML emails from templates with dynamic content.
     """
     
+    # Fallback text used when optional render arguments are omitted
+    _DEFAULT_HEADER = '📧 Business Communication'
+    _DEFAULT_CLOSING = 'We appreciate your partnership and look forward to continuing our collaboration.'
+    _DEFAULT_DETAILS_TITLE = 'Important Details'
+    _DEFAULT_HIGHLIGHT_TITLE = 'Please Note:'
+    _DEFAULT_ADDITIONAL_INFO_TITLE = 'Additional Information'
+    _DEFAULT_SIGNATURE = 'Accounts Team'
+    _DEFAULT_COMPANY = 'GenBooks'
+    
     def __init__(self, templates_dir: Optional[Path] = None):
         """
         Initialize the template renderer.
@@ -25,19 +209,87 @@ class EmailTemplateRenderer:
         Args:
             templates_dir: Directory containing email templates
         """
-        if templates_dir is None:
-            # Default to project root /templates directory
-            templates_dir = Path(__file__).parent.parent.parent / "templates"
+        # Resolved once so equivalent spellings of a directory share
+        # _template_cache entries; renders look templates up by name only
+        self.templates_dir = Path(templates_dir).resolve() if templates_dir else _DEFAULT_TEMPLATES_DIR
+        
+        # Read and split every template up front so rendering never rescans them;
+        # anything missing here is loaded on first use by _get_template()
+        self._templates: Dict[str, _CompiledTemplate] = {
+            path.name: self._load_template(path.name)
+            for pattern in ("*.html", "*.txt")
+            for path in self.templates_dir.glob(pattern)
+        }
         
-        self.templates_dir = templates_dir
+        self._init_render_caches()
         
-        logger.info(f"Email template renderer initialized. Templates dir: {templates_dir}")
+        logger.info("Email template renderer initialized. Templates dir: %s", self.templates_dir)
+    
+    def _init_render_caches(self) -> None:
+        """Create the per-renderer LRU caches of fully rendered emails."""
+        self._discrepancy_cache = functools.lru_cache(maxsize=512)(self._render_discrepancy)
+        self._regular_cache = functools.lru_cache(maxsize=512)(self._render_regular)
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # Bound-method caches cannot be pickled (e.g. for render_many workers)
+        state = self.__dict__.copy()
+        del state['_discrepancy_cache'], state['_regular_cache']
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_render_caches()
+    
+    def _load_template(self, name: str) -> _CompiledTemplate:
+        """Read a template file and compile it."""
+        template_path = self.templates_dir / name
+        compiled = _template_cache.get(template_path)
+        if compiled is None:
+            text = _read_file(template_path).decode('utf-8')
+            compiled = _template_cache[template_path] = _compile_template(text)
+        return compiled
+    
+    def _get_template(self, name: str) -> _CompiledTemplate:
+        """Get a compiled template, loading it if it was not preloaded."""
+        compiled = self._templates.get(name)
+        if compiled is None:
+            compiled = self._templates[name] = self._load_template(name)
+        return compiled
+    
+    def _render_template(self, name: str, mapping: Dict[str, str]) -> str:
+        """
+        Fill a compiled template in a single pass.
+        
+        All placeholder substitution goes through here: the template was
+        compiled once at load time, so rendering interleaves its literal
+        segments with mapping values (missing keys render as "") and
+        joins them, instead of scanning the whole template per placeholder.
+        """
+        literals, names = self._get_template(name)
+        get = mapping.get
+        out = []
+        append = out.append
+        for literal, slot in zip(literals, names):
+            append(literal)
+            append(get(slot, ''))
+        append(literals[-1])
+        return "".join(out)
+    
+    def _write_template(self, name: str, mapping: Dict[str, str], writer: TextIO) -> None:
+        """Like _render_template(), but write the segments to writer as they are produced."""
+        literals, names = self._get_template(name)
+        get = mapping.get
+        write = writer.write
+        for literal, slot in zip(literals, names):
+            write(literal)
+            write(get(slot, ''))
+        write(literals[-1])
     
     def render_discrepancy_email(
         self,
         vendor_name: str,
         intro_message: str,
-        discrepancies: list[Dict[str, str]],
+        discrepancies: list[Union[Dict[str, str], DiscrepancyRecord]],
         key_points: Optional[list[str]] = None,
         subject: str = "Invoice Discrepancy Notification",
         signature_name: str = "Accounts Payable Team",
@@ -48,95 +300,208 @@ class EmailTemplateRenderer:
         company_address: str = "",
         company_contact: str = "",
         **kwargs
-    ) -> tuple[str, str]:
+    ) -> RenderedEmail:
         """
         Render a discrepancy email.
         
+        Repeated calls with the same arguments are served from a cache.
+        
         Returns:
-            Tuple of (html_body, plain_text_body)
+            RenderedEmail of (html, plain) bodies
         """
-        template_path = self.templates_dir / 'discrepancy_email.html'
-        with open(template_path, 'r', encoding='utf-8') as f:
-            template = f.read()
+        return self._discrepancy_cache(
+            vendor_name,
+            intro_message,
+            _discrepancy_records(discrepancies),
+            tuple(key_points) if key_points else None,
+            subject,
+            signature_name,
+            company_name,
+            reply_to_email,
+            warning_message,
+            include_cta,
+            company_address,
+            company_contact,
+        )
+    
+    def render_discrepancy_email_to(
+        self,
+        writer: TextIO,
+        vendor_name: str,
+        intro_message: str,
+        discrepancies: list[Union[Dict[str, str], DiscrepancyRecord]],
+        key_points: Optional[list[str]] = None,
+        subject: str = "Invoice Discrepancy Notification",
+        signature_name: str = "Accounts Payable Team",
+        company_name: str = "GenBooks",
+        reply_to_email: str = "ap@genbooks.com",
+        warning_message: Optional[str] = None,
+        include_cta: bool = True,
+        company_address: str = "",
+        company_contact: str = "",
+        **kwargs
+    ) -> str:
+        """
+        Render a discrepancy email, streaming the HTML body to writer.
+        
+        The HTML is passed to writer.write() segment by segment instead of
+        being joined into one string first, for callers that feed it
+        straight into a buffer or socket. Not cached.
+        
+        Returns:
+            The plain text body
+        """
+        records = _discrepancy_records(discrepancies)
+        key_points = tuple(key_points) if key_points else None
+        mapping = self._discrepancy_mapping(
+            vendor_name,
+            intro_message,
+            records,
+            key_points,
+            subject,
+            signature_name,
+            company_name,
+            reply_to_email,
+            warning_message,
+            include_cta,
+            company_address,
+            company_contact,
+        )
+        self._write_template('discrepancy_email.html', mapping, writer)
+        return self._discrepancy_plain_text(
+            vendor_name, intro_message, records, key_points, signature_name, company_name
+        )
+    
+    def _render_discrepancy(
+        self,
+        vendor_name: str,
+        intro_message: str,
+        discrepancies: tuple[DiscrepancyRecord, ...],
+        key_points: Optional[tuple[str, ...]],
+        subject: str,
+        signature_name: str,
+        company_name: str,
+        reply_to_email: str,
+        warning_message: Optional[str],
+        include_cta: bool,
+        company_address: str,
+        company_contact: str,
+    ) -> RenderedEmail:
+        """Render a discrepancy email from normalized, hashable arguments."""
+        mapping = self._discrepancy_mapping(
+            vendor_name,
+            intro_message,
+            discrepancies,
+            key_points,
+            subject,
+            signature_name,
+            company_name,
+            reply_to_email,
+            warning_message,
+            include_cta,
+            company_address,
+            company_contact,
+        )
+        html_body = self._render_template('discrepancy_email.html', mapping)
+        plain_text = self._discrepancy_plain_text(
+            vendor_name, intro_message, discrepancies, key_points, signature_name, company_name
+        )
+        return RenderedEmail(html_body, plain_text)
+    
+    def _discrepancy_mapping(
+        self,
+        vendor_name: str,
+        intro_message: str,
+        discrepancies: tuple[DiscrepancyRecord, ...],
+        key_points: Optional[tuple[str, ...]],
+        subject: str,
+        signature_name: str,
+        company_name: str,
+        reply_to_email: str,
+        warning_message: Optional[str],
+        include_cta: bool,
+        company_address: str,
+        company_contact: str,
+    ) -> Dict[str, str]:
+        """Build the HTML placeholder mapping for a discrepancy email."""
+        # Placeholders left out of the mapping render as empty strings,
+        # so optional sections are only built when they have content.
+        # User-supplied values are HTML-escaped as they enter the mapping.
+        mapping = {
+            'SUBJECT': escape(str(subject)),
+            'VENDOR_NAME': escape(str(vendor_name)),
+            'INTRO_MESSAGE': escape(str(intro_message)),
+            'SIGNATURE_NAME': escape(str(signature_name)),
+            'COMPANY_NAME': escape(str(company_name)),
+        }
+        if company_address:
+            mapping['COMPANY_ADDRESS'] = escape(str(company_address))
+        if company_contact:
+            mapping['COMPANY_CONTACT'] = escape(str(company_contact))
         
         # Build discrepancies HTML
-        discrepancies_html = ""
         if discrepancies:
-            disc_items = ""
-            for disc in discrepancies:
-                title = disc.get('title') or disc.get('type', '')
-                details = disc.get('details', '')
-                disc_items += f"""
-            <div class="disc-item">
-                <strong>{title}</strong>
-                {details}
-            </div>"""
+            # Fragments go straight into one list, with no intermediate
+            # string per item, and are joined once
+            disc_parts = []
+            extend = disc_parts.extend
+            for record in discrepancies:
+                extend((_DISC_OPEN, escape(str(record.title)), _DISC_MID, escape(str(record.details)), _DISC_CLOSE))
             
-            discrepancies_html = f"""
-        <div class="section-title">
-            📋 Found Discrepancies
-        </div>
-
-        <div class="discrepancy-list">{disc_items}
-        </div>"""
+            mapping['DISCREPANCIES'] = _DISC_SECTION.format(items="".join(disc_parts))
         
         # Build key points HTML
-        key_points_html = ""
         if key_points:
-            points_list = "\n                ".join([f"<li>{point}</li>" for point in key_points])
-            key_points_html = f"""
-        <div class="section-title">
-            🔑 Key Details
-        </div>
-
-        <div class="key-points">
-            <ul>
-                {points_list}
-            </ul>
-        </div>"""
+            points_list = "\n                ".join([f"<li>{escape(str(point))}</li>" for point in key_points])
+            mapping['KEY_POINTS'] = _KEY_POINTS_SECTION.format(title='Key Details', items=points_list)
         
-        # Build CTA HTML
-        cta_html = ""
+        # Build CTA and warning HTML (cached)
         if include_cta:
-            cta_html = f"""
-        <div class="cta">
-            <a href="mailto:{reply_to_email}" class="cta-button">Reply to This Email</a>
-        </div>"""
-        
-        # Build warning HTML
-        warning_html = ""
+            mapping['CTA'] = _cta_html(reply_to_email, 'Reply to This Email')
         if warning_message:
-            warning_html = f"""
-        <div class="warning">
-            <div class="warning-icon">⚠️</div>
-            <div>{warning_message}</div>
-        </div>"""
-        
-        # Replace placeholders
-        html_body = template.replace('{{SUBJECT}}', subject)
-        html_body = html_body.replace('{{VENDOR_NAME}}', vendor_name)
-        html_body = html_body.replace('{{INTRO_MESSAGE}}', intro_message)
-        html_body = html_body.replace('{{DISCREPANCIES}}', discrepancies_html)
-        html_body = html_body.replace('{{KEY_POINTS}}', key_points_html)
-        html_body = html_body.replace('{{CTA}}', cta_html)
-        html_body = html_body.replace('{{WARNING}}', warning_html)
-        html_body = html_body.replace('{{SIGNATURE_NAME}}', signature_name)
-        html_body = html_body.replace('{{COMPANY_NAME}}', company_name)
-        html_body = html_body.replace('{{COMPANY_ADDRESS}}', company_address)
-        html_body = html_body.replace('{{COMPANY_CONTACT}}', company_contact)
-        
-        # Generate plain text version
-        context = {
-            'vendor_name': vendor_name,
-            'intro_message': intro_message,
-            'discrepancies': discrepancies,
-            'key_points': key_points,
-            'signature_name': signature_name,
-            'company_name': company_name,
-        }
-        plain_text = self._html_to_plain(html_body, context)
+            mapping['WARNING'] = _warning_html(warning_message)
         
-        return html_body, plain_text
+        return mapping
+    
+    def _discrepancy_plain_text(
+        self,
+        vendor_name: str,
+        intro_message: str,
+        discrepancies: tuple[DiscrepancyRecord, ...],
+        key_points: Optional[tuple[str, ...]],
+        signature_name: str,
+        company_name: str,
+    ) -> str:
+        """Render the plain text version of a discrepancy email."""
+        # Generate plain text version from its own template; directories
+        # without the .txt template fall back to _build_plain_text()
+        if 'discrepancy_email.txt' in self._templates:
+            text_mapping = {
+                'VENDOR_NAME': vendor_name,
+                'INTRO_MESSAGE': intro_message,
+                'SIGNATURE_NAME': signature_name,
+                'COMPANY_NAME': company_name,
+            }
+            if discrepancies:
+                text_mapping['DISCREPANCIES'] = _DISC_SECTION_TXT.format(items="".join([
+                    f"\n\n• {record.title or 'Issue'}\n  {record.details}" for record in discrepancies
+                ]))
+            if key_points:
+                text_mapping['KEY_POINTS'] = _KEY_POINTS_SECTION_TXT.format(
+                    items="".join([f"\n• {point}" for point in key_points])
+                )
+            plain_text = self._render_template('discrepancy_email.txt', text_mapping)
+        else:
+            plain_text = self._build_plain_text({
+                'vendor_name': vendor_name,
+                'intro_message': intro_message,
+                'discrepancies': discrepancies,
+                'key_points': key_points,
+                'signature_name': signature_name,
+                'company_name': company_name,
+            })
+        
+        return plain_text
     
     def render_regular_email(
         self,
@@ -161,95 +526,143 @@ class EmailTemplateRenderer:
         company_contact: str = "",
         footer_note: str = "Thank you for your business",
         **kwargs
-    ) -> tuple[str,str]:
+    ) -> RenderedEmail:
         """
         Render a regular business email.
         
+        Repeated calls with the same arguments are served from a cache.
+        
         Returns:
-            Tuple of (html_body, plain_text_body)
+            RenderedEmail of (html, plain) bodies
         """
-        template_path = self.templates_dir / 'regular_email.html'
-        with open(template_path, 'r', encoding='utf-8') as f:
-            template = f.read()
+        return self._regular_cache(
+            vendor_name,
+            intro_message,
+            tuple(key_points) if key_points else None,
+            subject,
+            header_title,
+            details_title,
+            highlight_message,
+            highlight_title,
+            additional_info,
+            additional_info_title,
+            closing_message,
+            followup_message,
+            signature_name,
+            company_name,
+            reply_to_email,
+            include_cta,
+            cta_text,
+            company_address,
+            company_contact,
+            footer_note,
+        )
+    
+    def _render_regular(
+        self,
+        vendor_name: str,
+        intro_message: str,
+        key_points: Optional[tuple[str, ...]],
+        subject: str,
+        header_title: Optional[str],
+        details_title: Optional[str],
+        highlight_message: Optional[str],
+        highlight_title: Optional[str],
+        additional_info: Optional[str],
+        additional_info_title: Optional[str],
+        closing_message: Optional[str],
+        followup_message: Optional[str],
+        signature_name: str,
+        company_name: str,
+        reply_to_email: str,
+        include_cta: bool,
+        cta_text: Optional[str],
+        company_address: str,
+        company_contact: str,
+        footer_note: str,
+    ) -> RenderedEmail:
+        """Render a regular business email from normalized, hashable arguments."""
+        # Placeholders left out of the mapping render as empty strings,
+        # so optional sections are only built when they have content.
+        # User-supplied values are HTML-escaped as they enter the mapping.
+        mapping = {
+            'SUBJECT': escape(str(subject)),
+            'HEADER_TITLE': escape(str(header_title or self._DEFAULT_HEADER)),
+            'VENDOR_NAME': escape(str(vendor_name)),
+            'INTRO_MESSAGE': escape(str(intro_message)),
+            'CLOSING_MESSAGE': escape(str(closing_message or self._DEFAULT_CLOSING)),
+            'SIGNATURE_NAME': escape(str(signature_name)),
+            'COMPANY_NAME': escape(str(company_name)),
+            'FOOTER_NOTE': escape(str(footer_note)),
+        }
+        if company_address:
+            mapping['COMPANY_ADDRESS'] = escape(str(company_address))
+        if company_contact:
+            mapping['COMPANY_CONTACT'] = escape(str(company_contact))
         
         # Build key points HTML
-        key_points_html = ""
         if key_points:
-            points_list = "\n                ".join([f"<li>{point}</li>" for point in key_points])
-            key_points_html = f"""
-        <div class="section-title">
-            🔑 {details_title or 'Important Details'}
-        </div>
-
-        <div class="key-points">
-            <ul>
-                {points_list}
-            </ul>
-        </div>"""
+            points_list = "\n                ".join([f"<li>{escape(str(point))}</li>" for point in key_points])
+            mapping['KEY_POINTS'] = _KEY_POINTS_SECTION.format(
+                title=escape(str(details_title or self._DEFAULT_DETAILS_TITLE)), items=points_list
+            )
         
-        # Build highlight HTML
-        highlight_html = ""
+        # Build highlight HTML (cached)
         if highlight_message:
-            highlight_html = f"""
-        <div class="highlight-box">
-            <strong>{highlight_title or 'Please Note:'}</strong><br>
-            {highlight_message}
-        </div>"""
+            mapping['HIGHLIGHT'] = _highlight_html(
+                highlight_title or self._DEFAULT_HIGHLIGHT_TITLE, highlight_message
+            )
         
         # Build additional info HTML
-        additional_info_html = ""
         if additional_info:
-            additional_info_html = f"""
-        <div class="info-box">
-            <div class="info-box-title">{additional_info_title or 'Additional Information'}</div>
-            <div>{additional_info}</div>
-        </div>"""
+            mapping['ADDITIONAL_INFO'] = _INFO_BOX.format(
+                title=escape(str(additional_info_title or self._DEFAULT_ADDITIONAL_INFO_TITLE)),
+                message=escape(str(additional_info)),
+            )
         
-        # Build CTA HTML
-        cta_html = ""
+        # Build CTA HTML (cached)
         if include_cta and cta_text:
-            cta_html = f"""
-        <div class="cta">
-            <a href="mailto:{reply_to_email}" class="cta-button">{cta_text}</a>
-        </div>"""
+            mapping['CTA'] = _cta_html(reply_to_email, cta_text)
         
         # Build followup message HTML
-        followup_html = ""
         if followup_message:
-            followup_html = f"""
-            <p>{followup_message}</p>"""
-        
-        # Replace placeholders
-        html_body = template.replace('{{SUBJECT}}', subject)
-        html_body = html_body.replace('{{HEADER_TITLE}}', header_title or '📧 Business Communication')
-        html_body = html_body.replace('{{VENDOR_NAME}}', vendor_name)
-        html_body = html_body.replace('{{INTRO_MESSAGE}}', intro_message)
-        html_body = html_body.replace('{{KEY_POINTS}}', key_points_html)
-        html_body = html_body.replace('{{HIGHLIGHT}}', highlight_html)
-        html_body = html_body.replace('{{ADDITIONAL_INFO}}', additional_info_html)
-        html_body = html_body.replace('{{CTA}}', cta_html)
-        html_body = html_body.replace('{{CLOSING_MESSAGE}}', closing_message or 'We appreciate your partnership and look forward to continuing our collaboration.')
-        html_body = html_body.replace('{{FOLLOWUP_MESSAGE}}', followup_html)
-        html_body = html_body.replace('{{SIGNATURE_NAME}}', signature_name)
-        html_body = html_body.replace('{{COMPANY_NAME}}', company_name)
-        html_body = html_body.replace('{{COMPANY_ADDRESS}}', company_address)
-        html_body = html_body.replace('{{COMPANY_CONTACT}}', company_contact)
-        html_body = html_body.replace('{{FOOTER_NOTE}}', footer_note)
-        
-        # Generate plain text version
-        context = {
-            'vendor_name': vendor_name,
-            'intro_message': intro_message,
-            'key_points': key_points,
-            'highlight_message': highlight_message,
-            'highlight_title': highlight_title,
-            'closing_message': closing_message,
-            'signature_name': signature_name,
-            'company_name': company_name,
-        }
-        plain_text = self._html_to_plain(html_body, context)
-        
-        return html_body, plain_text
+            mapping['FOLLOWUP_MESSAGE'] = _FOLLOWUP_BLOCK.format(message=escape(str(followup_message)))
+        
+        html_body = self._render_template('regular_email.html', mapping)
+        
+        # Generate plain text version from its own template; directories
+        # without the .txt template fall back to _build_plain_text()
+        if 'regular_email.txt' in self._templates:
+            text_mapping = {
+                'VENDOR_NAME': vendor_name,
+                'INTRO_MESSAGE': intro_message,
+                'SIGNATURE_NAME': signature_name,
+                'COMPANY_NAME': company_name,
+            }
+            if key_points:
+                text_mapping['KEY_POINTS'] = _KEY_POINTS_SECTION_TXT.format(
+                    items="".join([f"\n• {point}" for point in key_points])
+                )
+            if highlight_message:
+                text_mapping['HIGHLIGHT'] = _HIGHLIGHT_BLOCK_TXT.format(
+                    title=highlight_title or 'PLEASE NOTE', message=highlight_message
+                )
+            if closing_message:
+                text_mapping['CLOSING_MESSAGE'] = _CLOSING_BLOCK_TXT.format(message=closing_message)
+            plain_text = self._render_template('regular_email.txt', text_mapping)
+        else:
+            plain_text = self._build_plain_text({
+                'vendor_name': vendor_name,
+                'intro_message': intro_message,
+                'key_points': key_points,
+                'highlight_message': highlight_message,
+                'highlight_title': highlight_title,
+                'closing_message': closing_message,
+                'signature_name': signature_name,
+                'company_name': company_name,
+            })
+        
+        return RenderedEmail(html_body, plain_text)
     
     def render_visual_discrepancy_email(
         self,
@@ -281,457 +694,103 @@ class EmailTemplateRenderer:
         reference_number: str = "DISC-2023-0456-VISUAL",
         generation_date: str = "",
         **kwargs
-    ) -> tuple[str, str]:
+    ) -> RenderedEmail:
         """
         Render a visual invoice discrepancy email with bar charts and comparison boxes.
         
         Returns:
-            Tuple of (html_body, plain_text_body)
+            RenderedEmail of (html, plain) bodies
         """
-        from datetime import datetime
-        
         if not generation_date:
-            generation_date = datetime.now().strftime('%Y-%m-%d %H:%M')
-        
-        html_body = f'''<div style="font-family: 'Inter', 'Segoe UI', 'SF Pro Display', -apple-system, sans-serif; line-height: 1.6; color: #111827; max-width: 780px; margin: 0 auto; background: #ffffff; border-radius: 12px; overflow: hidden; box-shadow: 0 4px 24px rgba(0, 0, 0, 0.08);">
-   
-    <!-- Header with Visual Alert -->
-    <div style="background: linear-gradient(135deg, #dc2626 0%, #b91c1c 100%); color: #ffffff; padding: 30px 40px; text-align: left; position: relative;">
-        <div style="position: absolute; right: 30px; top: 30px; background: rgba(255, 255, 255, 0.2); padding: 10px 20px; border-radius: 30px; font-size: 12px; font-weight: 700; letter-spacing: 1px;">
-            ⚠️ MATCH FAILED
-        </div>
-        <h1 style="margin: 0 0 8px 0; font-size: 28px; font-weight: 800; letter-spacing: -0.5px; color: #ffffff;">INVOICE DISCREPANCY ALERT</h1>
-        <p style="margin: 0; font-size: 15px; color: #fecaca; font-weight: 400;">Visual Discrepancy Analysis Report</p>
-    </div>
-
-    <!-- Main Content -->
-    <div style="padding: 40px; background: #f9fafb;">
-       
-        <!-- Quick Summary Cards -->
-        <div style="display: flex; gap: 15px; margin-bottom: 35px;">
-            <div style="flex: 1; background: white; border-radius: 10px; padding: 20px; box-shadow: 0 2px 8px rgba(0, 0, 0, 0.05); border-top: 5px solid #dc2626;">
-                <div style="font-size: 13px; color: #6b7280; text-transform: uppercase; letter-spacing: 0.5px; margin-bottom: 8px;">Invoice Amount</div>
-                <div style="font-size: 28px; font-weight: 800; color: #dc2626;">${invoice_amount}</div>
-            </div>
-            <div style="flex: 1; background: white; border-radius: 10px; padding: 20px; box-shadow: 0 2px 8px rgba(0, 0, 0, 0.05); border-top: 5px solid #10b981;">
-                <div style="font-size: 13px; color: #6b7280; text-transform: uppercase; letter-spacing: 0.5px; margin-bottom: 8px;">PO Amount</div>
-                <div style="font-size: 28px; font-weight: 800; color: #10b981;">${po_amount}</div>
-            </div>
-            <div style="flex: 1; background: white; border-radius: 10px; padding: 20px; box-shadow: 0 2px 8px rgba(0, 0, 0, 0.05); border-top: 5px solid #f59e0b;">
-                <div style="font-size: 13px; color: #6b7280; text-transform: uppercase; letter-spacing: 0.5px; margin-bottom: 8px;">Variance</div>
-                <div style="font-size: 28px; font-weight: 800; color: #f59e0b;">${variance_amount}</div>
-            </div>
-        </div>
-
-        <!-- VISUAL DISCREPANCY GROUNDING SECTION -->
-        <div style="margin: 40px 0 30px 0;">
-            <div style="background: white; border-radius: 12px; padding: 30px; box-shadow: 0 4px 16px rgba(0, 0, 0, 0.08);">
-                <h2 style="margin: 0 0 25px 0; font-size: 22px; font-weight: 800; color: #111827; display: flex; align-items: center;">
-                    <span style="background: #dc2626; color: white; width: 36px; height: 36px; border-radius: 50%; display: inline-flex; align-items: center; justify-content: center; margin-right: 12px; font-size: 18px;">!</span>
-                    Visual Discrepancy Analysis
-                </h2>
-               
-                <!-- VISUAL BAR CHART - Actual vs Expected -->
-                <div style="margin-bottom: 35px;">
-                    <div style="display: flex; justify-content: space-between; margin-bottom: 15px;">
-                        <div style="font-size: 14px; font-weight: 600; color: #374151;">Amount Comparison Visualization</div>
-                        <div style="font-size: 13px; color: #6b7280;">Scale: 1px = ${scale_factor}</div>
-                    </div>
-                   
-                    <!-- Bar Chart Container -->
-                    <div style="background: #f3f4f6; border-radius: 8px; padding: 25px; position: relative;">
-                       
-                        <!-- Expected Amount Bar -->
-                        <div style="margin-bottom: 35px;">
-                            <div style="display: flex; justify-content: space-between; margin-bottom: 10px;">
-                                <span style="font-size: 14px; font-weight: 600; color: #059669;">Expected (PO)</span>
-                                <span style="font-size: 14px; font-weight: 700; color: #059669;">${po_amount}</span>
-                            </div>
-                            <div style="background: #d1fae5; height: 30px; border-radius: 6px; position: relative; overflow: hidden;">
-                                <div style="background: linear-gradient(90deg, #10b981 0%, #34d399 100%); width: 100%; height: 100%;">
-                                    <div style="position: absolute; right: 10px; top: 5px; color: #065f46; font-weight: 700; font-size: 13px;">100%</div>
-                                </div>
-                            </div>
-                        </div>
-                       
-                        <!-- Invoice Amount Bar -->
-                        <div style="margin-bottom: 20px;">
-                            <div style="display: flex; justify-content: space-between; margin-bottom: 10px;">
-                                <span style="font-size: 14px; font-weight: 600; color: #dc2626;">Invoice Submitted</span>
-                                <span style="font-size: 14px; font-weight: 700; color: #dc2626;">${invoice_amount}</span>
-                            </div>
-                            <div style="background: #fee2e2; height: 30px; border-radius: 6px; position: relative; overflow: hidden;">
-                                <div style="background: linear-gradient(90deg, #ef4444 0%, #f87171 100%); width: {invoice_percentage}%; height: 100%; position: relative;">
-                                    <div style="position: absolute; right: 10px; top: 5px; color: #991b1b; font-weight: 700; font-size: 13px;">{invoice_percentage}%</div>
-                                </div>
-                            </div>
-                        </div>
-                       
-                        <!-- Scale Ruler -->
-                        <div style="border-top: 2px solid #9ca3af; margin-top: 30px; padding-top: 15px; position: relative;">
-                            <div style="display: flex; justify-content: space-between; position: relative;">
-                                <div style="position: absolute; left: 0%; transform: translateX(-50%);">
-                                    <div style="height: 10px; width: 2px; background: #9ca3af; margin-bottom: 5px;"></div>
-                                    <div style="font-size: 11px; color: #6b7280; white-space: nowrap;">$0</div>
-                                </div>
-                                <div style="position: absolute; left: 20%; transform: translateX(-50%);">
-                                    <div style="height: 10px; width: 2px; background: #9ca3af; margin-bottom: 5px;"></div>
-                                    <div style="font-size: 11px; color: #6b7280; white-space: nowrap;">$2000</div>
-                                </div>
-                                <div style="position: absolute; left: 40%; transform: translateX(-50%);">
-                                    <div style="height: 10px; width: 2px; background: #9ca3af; margin-bottom: 5px;"></div>
-                                    <div style="font-size: 11px; color: #6b7280; white-space: nowrap;">$4000</div>
-                                </div>
-                                <div style="position: absolute; left: 60%; transform: translateX(-50%);">
-                                    <div style="height: 10px; width: 2px; background: #9ca3af; margin-bottom: 5px;"></div>
-                                    <div style="font-size: 11px; color: #6b7280; white-space: nowrap;">$6000</div>
-                                </div>
-                                <div style="position: absolute; left: 80%; transform: translateX(-50%);">
-                                    <div style="height: 10px; width: 2px; background: #9ca3af; margin-bottom: 5px;"></div>
-                                    <div style="font-size: 11px; color: #6b7280; white-space: nowrap;">$8000</div>
-                                </div>
-                                <div style="position: absolute; left: 100%; transform: translateX(-50%);">
-                                    <div style="height: 10px; width: 2px; background: #9ca3af; margin-bottom: 5px;"></div>
-                                    <div style="font-size: 11px; color: #6b7280; white-space: nowrap;">$10000</div>
-                                </div>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-               
-                <!-- MISMATCH HIGHLIGHT BOXES -->
-                <div style="display: grid; grid-template-columns: repeat(2, 1fr); gap: 20px; margin-bottom: 30px;">
-                    <!-- Expected Box -->
-                    <div style="background: linear-gradient(135deg, #ecfdf5 0%, #d1fae5 100%); border: 3px solid #10b981; border-radius: 10px; padding: 25px; position: relative;">
-                        <div style="position: absolute; top: -12px; left: 20px; background: #10b981; color: white; padding: 4px 15px; border-radius: 20px; font-size: 12px; font-weight: 700;">EXPECTED</div>
-                        <h3 style="margin: 15px 0 20px 0; font-size: 18px; font-weight: 800; color: #065f46; text-align: center;">Purchase Order</h3>
-                       
-                        <div style="background: white; border-radius: 8px; padding: 20px; margin-bottom: 15px;">
-                            <div style="font-size: 13px; color: #6b7280; margin-bottom: 8px;">PO Number</div>
-                            <div style="font-size: 20px; font-weight: 800; color: #065f46;">{po_number}</div>
-                        </div>
-                       
-                        <div style="display: flex; justify-content: space-between; margin-bottom: 15px;">
-                            <div>
-                                <div style="font-size: 12px; color: #6b7280;">Quantity</div>
-                                <div style="font-size: 18px; font-weight: 700; color: #065f46;">{po_qty} units</div>
-                            </div>
-                            <div>
-                                <div style="font-size: 12px; color: #6b7280;">Unit Price</div>
-                                <div style="font-size: 18px; font-weight: 700; color: #065f46;">${unit_price}</div>
-                            </div>
-                        </div>
-                       
-                        <div style="background: #10b981; color: white; padding: 12px; border-radius: 6px; text-align: center; font-weight: 700; font-size: 16px;">
-                            Total: ${po_amount}
-                        </div>
-                    </div>
-                   
-                    <!-- Actual Box -->
-                    <div style="background: linear-gradient(135deg, #fef2f2 0%, #fee2e2 100%); border: 3px solid #dc2626; border-radius: 10px; padding: 25px; position: relative;">
-                        <div style="position: absolute; top: -12px; left: 20px; background: #dc2626; color: white; padding: 4px 15px; border-radius: 20px; font-size: 12px; font-weight: 700;">INVOICED</div>
-                        <h3 style="margin: 15px 0 20px 0; font-size: 18px; font-weight: 800; color: #991b1b; text-align: center;">Invoice Submitted</h3>
-                       
-                        <div style="background: white; border-radius: 8px; padding: 20px; margin-bottom: 15px;">
-                            <div style="font-size: 13px; color: #6b7280; margin-bottom: 8px;">Invoice Number</div>
-                            <div style="font-size: 20px; font-weight: 800; color: #991b1b;">{invoice_number}</div>
-                        </div>
-                       
-                        <div style="display: flex; justify-content: space-between; margin-bottom: 15px;">
-                            <div>
-                                <div style="font-size: 12px; color: #6b7280;">Quantity</div>
-                                <div style="font-size: 18px; font-weight: 700; color: #991b1b;">{invoice_qty} units</div>
-                            </div>
-                            <div>
-                                <div style="font-size: 12px; color: #6b7280;">Unit Price</div>
-                                <div style="font-size: 18px; font-weight: 700; color: #991b1b;">${invoice_unit_price}</div>
-                            </div>
-                        </div>
-                       
-                        <div style="background: #dc2626; color: white; padding: 12px; border-radius: 6px; text-align: center; font-weight: 700; font-size: 16px;">
-                            Total: ${invoice_amount}
-                        </div>
-                    </div>
-                </div>
-               
-                <!-- VISUAL MISMATCH INDICATORS -->
-                <div style="background: #fffbeb; border: 2px dashed #f59e0b; border-radius: 10px; padding: 25px; margin-top: 30px;">
-                    <h3 style="margin: 0 0 20px 0; font-size: 18px; font-weight: 700; color: #92400e; display: flex; align-items: center;">
-                        <span style="background: #f59e0b; color: white; width: 28px; height: 28px; border-radius: 50%; display: inline-flex; align-items: center; justify-content: center; margin-right: 12px; font-size: 16px;">↔️</span>
-                        Visual Mismatch Indicators
-                    </h3>
-                   
-                    <div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 20px;">
-                        <div style="text-align: center;">
-                            <div style="background: #fee2e2; width: 80px; height: 80px; border-radius: 50%; display: flex; align-items: center; justify-content: center; margin: 0 auto 15px auto; border: 3px solid #dc2626;">
-                                <span style="font-size: 28px; font-weight: 800; color: #dc2626;">+{qty_variance_percentage}%</span>
-                            </div>
-                            <div style="font-size: 14px; font-weight: 600; color: #374151;">Quantity Variance</div>
-                            <div style="font-size: 12px; color: #6b7280;">Expected: {po_qty} → Actual: {invoice_qty}</div>
-                        </div>
-                       
-                        <div style="text-align: center;">
-                            <div style="background: #fee2e2; width: 80px; height: 80px; border-radius: 50%; display: flex; align-items: center; justify-content: center; margin: 0 auto 15px auto; border: 3px solid #dc2626;">
-                                <span style="font-size: 28px; font-weight: 800; color: #dc2626;">+{price_variance_percentage}%</span>
-                            </div>
-                            <div style="font-size: 14px; font-weight: 600; color: #374151;">Price Variance</div>
-                            <div style="font-size: 12px; color: #6b7280;">Expected: ${unit_price} → Actual: ${invoice_unit_price}</div>
-                        </div>
-                       
-                        <div style="text-align: center;">
-                            <div style="background: #fee2e2; width: 80px; height: 80px; border-radius: 50%; display: flex; align-items: center; justify-content: center; margin: 0 auto 15px auto; border: 3px solid #dc2626;">
-                                <span style="font-size: 28px; font-weight: 800; color: #dc2626;">+{variance_percentage}%</span>
-                            </div>
-                            <div style="font-size: 14px; font-weight: 600; color: #374151;">Total Variance</div>
-                            <div style="font-size: 12px; color: #6b7280;">${variance_amount} difference</div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-
-        <!-- DETAILED DISCREPANCY BREAKDOWN -->
-        <div style="margin: 40px 0 30px 0;">
-            <div style="background: white; border-radius: 12px; padding: 30px; box-shadow: 0 4px 16px rgba(0, 0, 0, 0.08);">
-                <h2 style="margin: 0 0 25px 0; font-size: 22px; font-weight: 800; color: #111827; border-bottom: 3px solid #3b82f6; padding-bottom: 10px;">
-                    Discrepancy Breakdown
-                </h2>
-               
-                <!-- Discrepancy Table -->
-                <table width="100%" cellpadding="0" cellspacing="0" style="border-collapse: collapse;">
-                    <thead>
-                        <tr style="background: #f3f4f6;">
-                            <th style="padding: 15px; text-align: left; font-size: 13px; font-weight: 700; color: #374151; border-bottom: 2px solid #d1d5db;">Field</th>
-                            <th style="padding: 15px; text-align: left; font-size: 13px; font-weight: 700; color: #374151; border-bottom: 2px solid #d1d5db;">Expected</th>
-                            <th style="padding: 15px; text-align: left; font-size: 13px; font-weight: 700; color: #374151; border-bottom: 2px solid #d1d5db;">Actual</th>
-                            <th style="padding: 15px; text-align: left; font-size: 13px; font-weight: 700; color: #374151; border-bottom: 2px solid #d1d5db;">Variance</th>
-                            <th style="padding: 15px; text-align: left; font-size: 13px; font-weight: 700; color: #374151; border-bottom: 2px solid #d1d5db;">Visual</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        <!-- Quantity Row -->
-                        <tr style="border-bottom: 1px solid #e5e7eb;">
-                            <td style="padding: 18px 15px; font-weight: 600; color: #374151;">Quantity</td>
-                            <td style="padding: 18px 15px; color: #059669; font-weight: 700;">{po_qty}</td>
-                            <td style="padding: 18px 15px; color: #dc2626; font-weight: 700;">{invoice_qty}</td>
-                            <td style="padding: 18px 15px; color: #f59e0b; font-weight: 700;">+{qty_variance}</td>
-                            <td style="padding: 18px 15px;">
-                                <div style="display: flex; align-items: center;">
-                                    <div style="width: 100px; background: #d1fae5; height: 8px; border-radius: 4px; margin-right: 10px; overflow: hidden;">
-                                        <div style="background: #10b981; height: 100%; width: 100%;"></div>
-                                    </div>
-                                    <div style="width: 110px; background: #fee2e2; height: 8px; border-radius: 4px; overflow: hidden;">
-                                        <div style="background: #ef4444; height: 100%; width: 100%;"></div>
-                                    </div>
-                                </div>
-                            </td>
-                        </tr>
-                       
-                        <!-- Unit Price Row -->
-                        <tr style="border-bottom: 1px solid #e5e7eb;">
-                            <td style="padding: 18px 15px; font-weight: 600; color: #374151;">Unit Price</td>
-                            <td style="padding: 18px 15px; color: #059669; font-weight: 700;">${unit_price}</td>
-                            <td style="padding: 18px 15px; color: #dc2626; font-weight: 700;">${invoice_unit_price}</td>
-                            <td style="padding: 18px 15px; color: #f59e0b; font-weight: 700;">+${price_variance}</td>
-                            <td style="padding: 18px 15px;">
-                                <div style="display: flex; align-items: center;">
-                                    <div style="width: 100px; background: #d1fae5; height: 8px; border-radius: 4px; margin-right: 10px; overflow: hidden;">
-                                        <div style="background: #10b981; height: 100%; width: 100%;"></div>
-                                    </div>
-                                    <div style="width: 113px; background: #fee2e2; height: 8px; border-radius: 4px; overflow: hidden;">
-                                        <div style="background: #ef4444; height: 100%; width: 100%;"></div>
-                                    </div>
-                                </div>
-                            </td>
-                        </tr>
-                       
-                        <!-- Tax Row -->
-                        <tr style="border-bottom: 1px solid #e5e7eb;">
-                            <td style="padding: 18px 15px; font-weight: 600; color: #374151;">Tax Rate</td>
-                            <td style="padding: 18px 15px; color: #059669; font-weight: 700;">{tax_rate}%</td>
-                            <td style="padding: 18px 15px; color: #dc2626; font-weight: 700;">{invoice_tax}%</td>
-                            <td style="padding: 18px 15px; color: #f59e0b; font-weight: 700;">+{tax_variance}%</td>
-                            <td style="padding: 18px 15px;">
-                                <div style="display: flex; align-items: center; justify-content: space-between;">
-                                    <div style="width: 45%; text-align: center; background: #d1fae5; padding: 5px; border-radius: 4px; font-size: 12px; font-weight: 700; color: #065f46;">
-                                        {tax_rate}%
-                                    </div>
-                                    <div style="color: #9ca3af; font-size: 12px;">→</div>
-                                    <div style="width: 45%; text-align: center; background: #fee2e2; padding: 5px; border-radius: 4px; font-size: 12px; font-weight: 700; color: #991b1b;">
-                                        {invoice_tax}%
-                                    </div>
-                                </div>
-                            </td>
-                        </tr>
-                    </tbody>
-                </table>
-            </div>
-        </div>
-
-        <!-- RESOLUTION TIMELINE -->
-        <div style="margin: 40px 0 30px 0;">
-            <div style="background: white; border-radius: 12px; padding: 30px; box-shadow: 0 4px 16px rgba(0, 0, 0, 0.08);">
-                <h2 style="margin: 0 0 25px 0; font-size: 22px; font-weight: 800; color: #111827; display: flex; align-items: center;">
-                    <span style="background: #3b82f6; color: white; width: 36px; height: 36px; border-radius: 50%; display: inline-flex; align-items: center; justify-content: center; margin-right: 12px; font-size: 18px;">⏰</span>
-                    Resolution Timeline
-                </h2>
-               
-                <!-- Timeline Visualization -->
-                <div style="position: relative; padding-left: 30px; margin: 30px 0;">
-                    <!-- Timeline Line -->
-                    <div style="position: absolute; left: 15px; top: 0; bottom: 0; width: 4px; background: #3b82f6; border-radius: 2px;"></div>
-                   
-                    <!-- Today -->
-                    <div style="position: relative; margin-bottom: 40px;">
-                        <div style="position: absolute; left: -30px; top: 0; background: #3b82f6; width: 30px; height: 30px; border-radius: 50%; border: 4px solid white; box-shadow: 0 0 0 3px #3b82f6;"></div>
-                        <div style="background: #eff6ff; padding: 20px; border-radius: 10px; margin-left: 20px; border: 2px solid #3b82f6;">
-                            <div style="font-weight: 800; color: #1e40af; margin-bottom: 5px;">Today - Discrepancy Identified</div>
-                            <div style="color: #6b7280; font-size: 14px;">Automated system detected {discrepancy_count} mismatches</div>
-                        </div>
-                    </div>
-                   
-                    <!-- Day 2 -->
-                    <div style="position: relative; margin-bottom: 40px;">
-                        <div style="position: absolute; left: -30px; top: 0; background: #f59e0b; width: 30px; height: 30px; border-radius: 50%; border: 4px solid white; box-shadow: 0 0 0 3px #f59e0b;"></div>
-                        <div style="background: #fffbeb; padding: 20px; border-radius: 10px; margin-left: 20px; border: 2px solid #f59e0b;">
-                            <div style="font-weight: 800; color: #92400e; margin-bottom: 5px;">Within 24 Hours - Acknowledgement Required</div>
-                            <div style="color: #6b7280; font-size: 14px;">Vendor to acknowledge receipt and provide preliminary response</div>
-                        </div>
-                    </div>
-                   
-                    <!-- Day 5 -->
-                    <div style="position: relative; margin-bottom: 40px;">
-                        <div style="position: absolute; left: -30px; top: 0; background: #dc2626; width: 30px; height: 30px; border-radius: 50%; border: 4px solid white; box-shadow: 0 0 0 3px #dc2626;"></div>
-                        <div style="background: #fef2f2; padding: 20px; border-radius: 10px; margin-left: 20px; border: 2px solid #dc2626;">
-                            <div style="font-weight: 800; color: #991b1b; margin-bottom: 5px;">By {resolution_deadline} - Full Resolution Required</div>
-                            <div style="color: #6b7280; font-size: 14px;">Submit corrected invoice or detailed explanation to avoid payment delays</div>
-                        </div>
-                    </div>
-                   
-                    <!-- Resolution -->
-                    <div style="position: relative;">
-                        <div style="position: absolute; left: -30px; top: 0; background: #10b981; width: 30px; height: 30px; border-radius: 50%; border: 4px solid white; box-shadow: 0 0 0 3px #10b981;"></div>
-                        <div style="background: #ecfdf5; padding: 20px; border-radius: 10px; margin-left: 20px; border: 2px solid #10b981;">
-                            <div style="font-weight: 800; color: #065f46; margin-bottom: 5px;">After Resolution - Payment Processing</div>
-                            <div style="color: #6b7280; font-size: 14px;">Payment will be processed within 5 business days of discrepancy resolution</div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-
-        <!-- ACTION BUTTONS -->
-        <div style="text-align: center; margin: 40px 0;">
-            <a href="mailto:{reply_to_email}" style="display: inline-block; background: linear-gradient(135deg, #3b82f6 0%, #1e40af 100%); color: white; padding: 18px 45px; text-decoration: none; border-radius: 10px; font-weight: 800; font-size: 16px; box-shadow: 0 6px 20px rgba(59, 130, 246, 0.4); margin: 0 10px; letter-spacing: 0.5px; border: none;">
-                📧 Respond with Explanation
-            </a>
-            <a href="{portal_url}" style="display: inline-block; background: linear-gradient(135deg, #10b981 0%, #059669 100%); color: white; padding: 18px 45px; text-decoration: none; border-radius: 10px; font-weight: 800; font-size: 16px; box-shadow: 0 6px 20px rgba(16, 185, 129, 0.4); margin: 0 10px; letter-spacing: 0.5px; border: none;">
-                🔗 Upload Corrected Invoice
-            </a>
-        </div>
-
-    </div>
-
-    <!-- Footer -->
-    <div style="background: linear-gradient(135deg, #1e293b 0%, #0f172a 100%); color: #f1f5f9; padding: 30px 40px; text-align: center;">
-        <div style="max-width: 600px; margin: 0 auto;">
-            <div style="font-size: 24px; font-weight: 800; color: #ffffff; margin-bottom: 20px; letter-spacing: -0.5px;">{company_name}</div>
-            <div style="font-size: 14px; color: #cbd5e1; margin-bottom: 25px; line-height: 1.6;">
-                This visual discrepancy report was automatically generated by our AP Automation System.<br>
-                For assistance, contact {reply_to_email} or call {company_contact}
-            </div>
-            <div style="border-top: 1px solid #334155; padding-top: 20px; font-size: 12px; color: #94a3b8;">
-                Reference: {reference_number} |
-                Generated: {generation_date} |
-                System: AP Automation v3.2
-            </div>
-        </div>
-    </div>
-
-</div>'''
-
-        # Generate simple plain text version
-        plain_text = f"""
-INVOICE DISCREPANCY ALERT
-Visual Discrepancy Analysis Report
-
-QUICK SUMMARY
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Invoice Amount:  ${invoice_amount}
-PO Amount:       ${po_amount}
-Variance:        ${variance_amount}
-
-
-VISUAL DISCREPANCY ANALYSIS
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-AMOUNT COMPARISON
-Expected (PO):      ${po_amount} [████████████████████] 100%
-Invoice Submitted:  ${invoice_amount} [█████████████████████████] {invoice_percentage}%
-
-PURCHASE ORDER (EXPECTED)
-  PO Number:    {po_number}
-  Quantity:     {po_qty} units
-  Unit Price:   ${unit_price}
-  Total:        ${po_amount}
-
-INVOICE SUBMITTED
-  Invoice No:   {invoice_number}
-  Quantity:     {invoice_qty} units
-  Unit Price:   ${invoice_unit_price}
-  Total:        ${invoice_amount}
-
-VARIANCE INDICATORS
-  Quantity Variance:  +{qty_variance_percentage}% (Expected: {po_qty} → Actual: {invoice_qty})
-  Price Variance:     +{price_variance_percentage}% (Expected: ${unit_price} → Actual: ${invoice_unit_price})
-  Total Variance:     +{variance_percentage}% (${variance_amount} difference)
-
-
-DISCREPANCY BREAKDOWN
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Field          Expected      Actual        Variance
-─────────────────────────────────────────────────
-Quantity       {po_qty}          {invoice_qty}          +{qty_variance}
-Unit Price     ${unit_price}     ${invoice_unit_price}  +${price_variance}
-Tax Rate       {tax_rate}%       {invoice_tax}%         +{tax_variance}%
-
-
-RESOLUTION TIMELINE
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-○ Today - Discrepancy Identified
-  Automated system detected {discrepancy_count} mismatches
-
-○ Within 24 Hours - Acknowledgement Required
-  Vendor to acknowledge receipt and provide preliminary response
-
-○ By {resolution_deadline} - Full Resolution Required
-  Submit corrected invoice or detailed explanation to avoid payment delays
-
-○ After Resolution - Payment Processing
-  Payment will be processed within 5 business days of discrepancy resolution
-
-
-ACTIONS REQUIRED
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-• Reply with explanation: {reply_to_email}
-• Upload corrected invoice: {portal_url}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-{company_name}
-This visual discrepancy report was automatically generated by our AP Automation System.
-For assistance, contact {reply_to_email} or call {company_contact}
-
-Reference: {reference_number} | Generated: {generation_date} | System: AP Automation v3.2
-"""
+            # Formatted once per minute, not once per email in a batch
+            generation_date = _minute_stamp(int(time.time()) // 60)
+        
+        # Cast once at the boundary; every placeholder site for a key then
+        # reuses the same string, and the HTML gets one escaped copy of each
+        mapping = {
+            'INVOICE_AMOUNT': str(invoice_amount),
+            'PO_AMOUNT': str(po_amount),
+            'VARIANCE_AMOUNT': str(variance_amount),
+            'INVOICE_PERCENTAGE': str(invoice_percentage),
+            'VARIANCE_PERCENTAGE': str(variance_percentage),
+            'SCALE_FACTOR': str(scale_factor),
+            'PO_NUMBER': str(po_number),
+            'PO_QTY': str(po_qty),
+            'UNIT_PRICE': str(unit_price),
+            'INVOICE_NUMBER': str(invoice_number),
+            'INVOICE_QTY': str(invoice_qty),
+            'INVOICE_UNIT_PRICE': str(invoice_unit_price),
+            'QTY_VARIANCE_PERCENTAGE': str(qty_variance_percentage),
+            'PRICE_VARIANCE_PERCENTAGE': str(price_variance_percentage),
+            'QTY_VARIANCE': str(qty_variance),
+            'PRICE_VARIANCE': str(price_variance),
+            'TAX_RATE': str(tax_rate),
+            'INVOICE_TAX': str(invoice_tax),
+            'TAX_VARIANCE': str(tax_variance),
+            'DISCREPANCY_COUNT': str(discrepancy_count),
+            'RESOLUTION_DEADLINE': str(resolution_deadline),
+            'COMPANY_NAME': str(company_name),
+            'REPLY_TO_EMAIL': str(reply_to_email),
+            'COMPANY_CONTACT': str(company_contact),
+            'PORTAL_URL': str(portal_url),
+            'REFERENCE_NUMBER': str(reference_number),
+            'GENERATION_DATE': str(generation_date),
+        }
+        html_mapping = {key: escape(value) for key, value in mapping.items()}
+        html_body = self._render_template('visual_discrepancy_email.html', html_mapping)
+        plain_text = self._render_template('visual_discrepancy_email.txt', mapping)
+        
+        return RenderedEmail(html_body, plain_text)
+    
+    def render_many(
+        self,
+        kind: str,
+        params_list: list[Dict[str, Any]],
+        max_workers: Optional[int] = None,
+        use_threads: bool = False,
+    ) -> list[RenderedEmail]:
+        """
+        Render a batch of emails of one kind across worker processes.
         
-        return html_body, plain_text
+        Workers receive this renderer with its templates already loaded,
+        so they never read template files themselves. With use_threads,
+        a thread pool shares this renderer and its render caches instead;
+        that avoids process start-up and pickling, but on a GIL build of
+        CPython the renders themselves still run one at a time.
+        
+        Args:
+            kind: "discrepancy", "regular" or "visual_discrepancy"
+            params_list: Keyword arguments for each render call
+            max_workers: Number of workers (defaults to the executor's default)
+            use_threads: Render in a thread pool instead of worker processes
+        
+        Returns:
+            List of RenderedEmail results in input order
+        """
+        if not hasattr(self, f"render_{kind}_email"):
+            raise ValueError(f"Unknown email kind: {kind}")
+        
+        if not params_list:
+            return []
+        
+        if use_threads:
+            render = getattr(self, f"render_{kind}_email")
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return list(executor.map(lambda params: render(**params), params_list))
+        
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_render_worker,
+            initargs=(self,),
+        ) as executor:
+            return list(executor.map(_render_one, [(kind, params) for params in params_list]))
     
-    def _html_to_plain(self, html: str, context: Dict[str, Any]) -> str:
+    def _build_plain_text(self, context: Dict[str, Any]) -> str:
         """
-        Convert HTML email to plain text version.
+        Build the plain text version of an email from its render context.
         
-        For now, creates a simple plain text version from context.
-        In production, you might want to use html2text library.
+        Fallback for template directories without .txt templates. The
+        rendered HTML is never parsed; everything needed is in context.
         """
         parts = []
         
@@ -747,10 +806,8 @@ Reference: {reference_number} | Generated: {generation_date} | System: AP Automa
         if context.get('discrepancies'):
             parts.append("\nFOUND DISCREPANCIES:\n")
             parts.append("-" * 50)
-            for disc in context['discrepancies']:
-                title = disc.get('title') or disc.get('type', 'Issue')
-                details = disc.get('details', '')
-                parts.append(f"\n• {title}\n  {details}")
+            for record in context['discrepancies']:
+                parts.append(f"\n• {record.title or 'Issue'}\n  {record.details}")
             parts.append("\n")
         
         # Key points
@@ -762,7 +819,7 @@ Reference: {reference_number} | Generated: {generation_date} | System: AP Automa
         
         # Highlight message
         if context.get('highlight_message'):
-            parts.append(f"\n{context.get('highlight_title', 'PLEASE NOTE')}:")
+            parts.append(f"\n{context.get('highlight_title') or 'PLEASE NOTE'}:")
             parts.append(f"{context['highlight_message']}\n")
         
         # Closing
@@ -771,7 +828,22 @@ Reference: {reference_number} | Generated: {generation_date} | System: AP Automa
         
         # Signature
         parts.append("\nBest regards,")
-        parts.append(context.get('signature_name', 'Accounts Team'))
-        parts.append(context.get('company_name', 'GenBooks'))
+        parts.append(context.get('signature_name', self._DEFAULT_SIGNATURE))
+        parts.append(context.get('company_name', self._DEFAULT_COMPANY))
         
         return "\n".join(parts)
+
+
+_renderer_singleton: Optional[EmailTemplateRenderer] = None
+
+
+def get_renderer() -> EmailTemplateRenderer:
+    """
+    Get the process-wide template renderer.
+    
+    Templates are read from disk once, the first time this is called.
+    """
+    global _renderer_singleton
+    if _renderer_singleton is None:
+        _renderer_singleton = EmailTemplateRenderer()
+    return _renderer_singleton
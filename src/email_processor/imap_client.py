@@ -4,19 +4,30 @@ Gmail IMAP Client for reading emails.
 Provides a robust IMAP client for connecting to Gmail and fetching emails.
 """
 
+import asyncio
+import codecs
 import email
+import functools
 import imaplib
 import logging
+import re
+import ssl
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime
 from email.header import decode_header
-from email.utils import parseaddr, parsedate_to_datetime
-from typing import List, Optional, Tuple, Generator
+from email.utils import getaddresses, parseaddr, parsedate_to_datetime
+from html import unescape
+from typing import Dict, List, Literal, Optional, Tuple, Generator
 from contextlib import contextmanager
 
-from bs4 import BeautifulSoup
+import aioimaplib
 import html2text
 
 from email_processor.config import Settings
+from email_processor.connection_pool import ConnectionPool
 from email_processor.models import (
     EmailMessage,
     EmailAddress,
@@ -26,11 +37,271 @@ from email_processor.models import (
 logger = logging.getLogger(__name__)
 
 
+# One TLS context for every IMAP connection in the process, so the CA
+# store is loaded once instead of once per connection
+_TLS_CONTEXT = ssl.create_default_context()
+
+# Messages requested per FETCH command in fetch_emails()
+_FETCH_BATCH_SIZE = 50
+
+# UID FETCH items per fetch mode: whole messages, or headers only. RFC822
+# sets \Seen on the server as a side effect, as plain fetches always have;
+# BODY.PEEK leaves it alone, so a metadata fetch does not mark anything read.
+FetchMode = Literal["full", "metadata"]
+_FETCH_ITEMS = {
+    "full": "(UID RFC822)",
+    "metadata": "(UID BODY.PEEK[HEADER])",
+}
+
+# UID item in a FETCH response, e.g. b'12 (UID 4031 RFC822 {2714}'
+_UID_RE = re.compile(rb'\bUID (\d+)')
+
+# aioimaplib FETCH response line announcing a literal: b'<n> FETCH (UID <uid> RFC822 {size}'
+_ASYNC_FETCH_LINE_RE = re.compile(rb'^\d+ FETCH .*\{\d+\}$')
+
+# A <message-id> in References and similar threading headers
+_MSGID_RE = re.compile(r"<[^>]+>")
+
+# Result of an ESEARCH (RFC 4731) UID SEARCH RETURN (ALL), e.g. b'(TAG "A5") UID ALL 1:3,7'
+_ESEARCH_ALL_RE = re.compile(rb'\bALL (\S+)')
+
+
+def _sequence_set(numbers: List[int]) -> bytes:
+    """Build an IMAP sequence set such as b"1:3,7,9:10" from message numbers."""
+    ranges = []
+    start = prev = None
+    for number in sorted(set(numbers)):
+        if prev is not None and number == prev + 1:
+            prev = number
+            continue
+        if start is not None:
+            ranges.append(f"{start}:{prev}" if prev != start else str(start))
+        start = prev = number
+    if start is not None:
+        ranges.append(f"{start}:{prev}" if prev != start else str(start))
+    return ",".join(ranges).encode()
+
+
+@functools.lru_cache(maxsize=64)
+def _codec_name(charset: Optional[str]) -> str:
+    """Resolve a MIME charset to a Python codec name, falling back to UTF-8."""
+    if charset:
+        try:
+            return codecs.lookup(charset).name
+        except LookupError:
+            logger.debug("Unknown charset %r, decoding as UTF-8", charset)
+    return 'utf-8'
+
+
+def _decoded_size(part: email.message.Message) -> int:
+    """Size of a part's decoded payload; base64 sizes are computed, not decoded."""
+    encoded = part.get_payload()
+    if isinstance(encoded, str) and part.get("Content-Transfer-Encoding", "").strip().lower() == "base64":
+        length = len(encoded)
+        for whitespace in ("\n", "\r", " ", "\t"):
+            length -= encoded.count(whitespace)
+        tail = encoded.rstrip()
+        padding = 2 if tail.endswith("==") else 1 if tail.endswith("=") else 0
+        return length * 3 // 4 - padding
+    return len(part.get_payload(decode=True) or b"")
+
+
+# Tag stripping for when html2text fails
+_SCRIPT_STYLE_RE = re.compile(r"<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def _strip_html(html_body: str) -> str:
+    """Reduce HTML to its text lines without building a parse tree."""
+    text = unescape(_TAG_RE.sub("\n", _SCRIPT_STYLE_RE.sub("", html_body)))
+    return "\n".join([line.strip() for line in text.splitlines() if line.strip()])
+
+
+def _parse_sequence_set(sequence_set: bytes) -> List[int]:
+    """Expand an IMAP sequence set such as b"1:3,7" into [1, 2, 3, 7]."""
+    numbers = []
+    for part in sequence_set.split(b","):
+        first, _, last = part.partition(b":")
+        if last:
+            low, high = sorted((int(first), int(last)))
+            numbers.extend(range(low, high + 1))
+        else:
+            numbers.append(int(first))
+    return numbers
+
+
+def _fetched_by_uid(data: list) -> Dict[int, bytes]:
+    """Map UIDs to message literals in an imaplib UID FETCH response."""
+    # Items are (b'<n> (UID <uid> RFC822 {size}', literal) tuples followed by
+    # b')'; servers may also send the UID after the literal, in that b' UID <uid>)'
+    fetched = {}
+    for i, item in enumerate(data):
+        if not isinstance(item, tuple):
+            continue
+        match = _UID_RE.search(item[0])
+        if match is None and i + 1 < len(data) and isinstance(data[i + 1], bytes):
+            match = _UID_RE.search(data[i + 1])
+        if match:
+            fetched[int(match.group(1))] = item[1]
+    return fetched
+
+
+def _html_to_text(html_body: str) -> str:
+    """Convert an HTML body to text with html2text."""
+    # HTML2Text keeps parser state between handle() calls, so a shared
+    # instance leaks unclosed tags from one message into the next. A fresh
+    # converter costs microseconds next to the conversion itself.
+    converter = html2text.HTML2Text()
+    converter.ignore_links = False
+    converter.ignore_images = True
+    return converter.handle(html_body)
+
+
+@functools.lru_cache(maxsize=8192)
+def _decode_header_cached(value: str) -> str:
+    """Decode an RFC 2047 header value; mailing lists repeat the same ones."""
+    # Values without encoded-words come back from decode_header() unchanged.
+    # Header objects (raw 8-bit headers, via __wrapped__) must be decoded.
+    if isinstance(value, str) and "=?" not in value:
+        return value
+    
+    decoded_parts = []
+    for part, encoding in decode_header(value):
+        if isinstance(part, bytes):
+            try:
+                decoded_parts.append(part.decode(encoding or 'utf-8', errors='replace'))
+            except:
+                decoded_parts.append(part.decode('utf-8', errors='replace'))
+        else:
+            decoded_parts.append(str(part))
+    
+    return ''.join(decoded_parts)
+
+
+@functools.lru_cache(maxsize=8192)
+def _parse_address_cached(addr_string: str) -> Tuple[str, Optional[str]]:
+    """Split one address into (email, decoded display name or None)."""
+    name, address = parseaddr(addr_string)
+    name = _decode_header_cached(name) if name else None
+    return address or addr_string, name
+
+
 class IMAPError(Exception):
     """Custom exception for IMAP operations."""
     pass
 
 
+def _open_connection(settings: Settings) -> imaplib.IMAP4:
+    """Open and authenticate a new IMAP connection."""
+    logger.info(f"Connecting to {settings.imap_server}:{settings.imap_port}")
+    
+    if settings.imap_use_ssl:
+        connection = imaplib.IMAP4_SSL(settings.imap_server, settings.imap_port, ssl_context=_TLS_CONTEXT)
+    else:
+        connection = imaplib.IMAP4(settings.imap_server, settings.imap_port)
+
+    # Login
+    connection.login(settings.gmail_email, settings.gmail_app_password.get_secret_value())
+    logger.info("Successfully authenticated with Gmail")
+    return connection
+
+
+def _logout_quietly(connection: imaplib.IMAP4) -> None:
+    """Log out, ignoring errors from a connection that is already gone."""
+    try:
+        connection.logout()
+        logger.info("Disconnected from IMAP server")
+    except:
+        pass
+
+
+class IMAPPool(ConnectionPool[imaplib.IMAP4]):
+    """
+    Pool of authenticated IMAP connections, reused across connect() calls.
+    
+    Idle connections are kept per (server, port, account) and sent a NOOP
+    every keepalive_interval seconds, well inside Gmail's 29 minute idle
+    limit. A connection that fails its NOOP, or was released after an
+    error, is discarded and replaced by a fresh login on the next acquire.
+    """
+
+    def __init__(self, max_idle: int = 4, keepalive_interval: float = 240.0):
+        super().__init__(max_idle)
+        self.keepalive_interval = keepalive_interval
+        self._timer: Optional[threading.Timer] = None
+
+    def _key(self, settings: Settings) -> Tuple[str, int, str]:
+        return settings.imap_server, settings.imap_port, settings.gmail_email
+
+    def _open(self, settings: Settings) -> imaplib.IMAP4:
+        return _open_connection(settings)
+
+    def _is_alive(self, connection: imaplib.IMAP4) -> bool:
+        try:
+            connection.noop()
+            return True
+        except (imaplib.IMAP4.abort, OSError):
+            return False
+
+    def _close(self, connection: imaplib.IMAP4) -> None:
+        _logout_quietly(connection)
+
+    def _on_idle(self) -> None:
+        self._schedule_keepalive()
+
+    def close(self) -> None:
+        """Log out every idle connection and stop the keepalive timer."""
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+        super().close()
+
+    def _schedule_keepalive(self) -> None:
+        # Called with the lock held
+        if self._timer is None:
+            self._timer = threading.Timer(self.keepalive_interval, self._keepalive)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _keepalive(self) -> None:
+        """NOOP connections idle for a full interval; drop the ones that fail."""
+        with self._lock:
+            self._timer = None
+            due = []
+            now = time.monotonic()
+            for key, connections in self._idle.items():
+                for entry in connections:
+                    if now - entry[1] >= self.keepalive_interval:
+                        due.append((key, entry))
+            for key, entry in due:
+                self._idle[key].remove(entry)
+        
+        for key, (connection, _) in due:
+            try:
+                connection.noop()
+            except (imaplib.IMAP4.abort, OSError):
+                logger.info("Dropping dead pooled IMAP connection")
+                continue
+            with self._lock:
+                self._idle.setdefault(key, []).append((connection, time.monotonic()))
+        
+        with self._lock:
+            if any(self._idle.values()):
+                self._schedule_keepalive()
+
+
+
+def _parse_batch_in_worker(
+    batch: List[int],
+    raw_by_uid: Dict[int, bytes],
+    headers_only: bool
+) -> List[EmailMessage]:
+    """Parse a fetched batch in a fetch_emails() worker process."""
+    # Parsing uses no settings or connection state
+    return GmailIMAPClient(None)._parse_batch(batch, raw_by_uid, headers_only)
+
+
 class GmailIMAPClient:
     """
     Gmail IMAP client for reading and managing emails.
@@ -43,39 +314,33 @@ class GmailIMAPClient:
     - Moving emails to folders
     """
 
-    def __init__(self, settings: Settings):
-        """Initialize the IMAP client with settings."""
+    def __init__(self, settings: Settings, pool: Optional["IMAPPool"] = None):
+        """
+        Initialize the IMAP client with settings.
+        
+        With a pool, connect() borrows an authenticated connection from it
+        and hands it back afterwards instead of logging in and out.
+        """
         self.settings = settings
+        self.pool = pool
         self._connection: Optional[imaplib.IMAP4_SSL] = None
-        self._h2t = html2text.HTML2Text()
-        self._h2t.ignore_links = False
-        self._h2t.ignore_images = True
+        # Folder selected on _connection by select_folder(), and its count
+        self._selected_folder: Optional[str] = None
+        self._selected_count = 0
 
     @contextmanager
     def connect(self):
         """Context manager for IMAP connection."""
+        reusable = False
+        self._selected_folder = None
         try:
-            logger.info(f"Connecting to {self.settings.imap_server}:{self.settings.imap_port}")
-            
-            if self.settings.imap_use_ssl:
-                self._connection = imaplib.IMAP4_SSL(
-                    self.settings.imap_server,
-                    self.settings.imap_port
-                )
+            if self.pool:
+                self._connection = self.pool.acquire(self.settings)
             else:
-                self._connection = imaplib.IMAP4(
-                    self.settings.imap_server,
-                    self.settings.imap_port
-                )
-
-            # Login
-            self._connection.login(
-                self.settings.gmail_email,
-                self.settings.gmail_app_password.get_secret_value()
-            )
-            logger.info("Successfully authenticated with Gmail")
+                self._connection = _open_connection(self.settings)
             
             yield self
+            reusable = True
             
         except imaplib.IMAP4.error as e:
             logger.error(f"IMAP authentication failed: {e}")
@@ -85,74 +350,108 @@ class GmailIMAPClient:
             raise IMAPError(f"Connection failed: {e}")
         finally:
             if self._connection:
-                try:
-                    self._connection.logout()
-                    logger.info("Disconnected from IMAP server")
-                except:
-                    pass
+                if self.pool:
+                    # A connection that saw an error may be mid-response; drop it
+                    self.pool.release(self.settings, self._connection, reusable)
+                else:
+                    _logout_quietly(self._connection)
                 self._connection = None
+                self._selected_folder = None
 
     def _decode_header_value(self, value: str) -> str:
         """Decode email header value."""
         if not value:
             return ""
-        
-        decoded_parts = []
-        for part, encoding in decode_header(value):
-            if isinstance(part, bytes):
-                try:
-                    decoded_parts.append(part.decode(encoding or 'utf-8', errors='replace'))
-                except:
-                    decoded_parts.append(part.decode('utf-8', errors='replace'))
-            else:
-                decoded_parts.append(str(part))
-        
-        return ''.join(decoded_parts)
+        if isinstance(value, str):
+            return _decode_header_cached(value)
+        # email.header.Header objects are not hashable
+        return _decode_header_cached.__wrapped__(value)
 
     def _parse_email_address(self, addr_string: str) -> EmailAddress:
         """Parse email address string into EmailAddress object."""
-        name, email = parseaddr(addr_string)
-        name = self._decode_header_value(name) if name else None
-        return EmailAddress(email=email or addr_string, name=name)
+        if isinstance(addr_string, str):
+            address, name = _parse_address_cached(addr_string)
+        else:
+            address, name = _parse_address_cached.__wrapped__(addr_string)
+        return EmailAddress(email=address, name=name)
 
     def _parse_email_addresses(self, header_value: Optional[str]) -> List[EmailAddress]:
         """Parse multiple email addresses from header."""
         if not header_value:
             return []
         
+        # getaddresses() honours quoted commas, e.g. "Doe, John" <j@x.com>
         addresses = []
-        for addr in header_value.split(','):
-            addr = addr.strip()
-            if addr:
-                try:
-                    addresses.append(self._parse_email_address(addr))
-                except:
-                    pass
+        for name, address in getaddresses([str(header_value)]):
+            if not address:
+                continue
+            try:
+                addresses.append(EmailAddress(
+                    email=address,
+                    name=self._decode_header_value(name) if name else None
+                ))
+            except ValueError:
+                # Not a valid address (pydantic's ValidationError is a ValueError)
+                pass
         return addresses
 
-    def _extract_body(self, msg: email.message.Message) -> Tuple[Optional[str], Optional[str]]:
-        """Extract text and HTML body from email message."""
+    def _extract_parts(
+        self,
+        msg: email.message.Message
+    ) -> Tuple[Optional[str], Optional[str], List[EmailAttachment]]:
+        """Extract text body, HTML body and attachments in a single walk."""
         text_body = None
         html_body = None
+        attachments = []
 
         if msg.is_multipart():
-            for part in msg.walk():
+            # Explicit stack instead of the recursive msg.walk() generator;
+            # children are pushed reversed so parts come off in document order
+            stack = list(reversed(msg.get_payload()))
+            while stack:
+                part = stack.pop()
+                if part.is_multipart():
+                    stack.extend(reversed(part.get_payload()))
+                    continue
+
                 content_type = part.get_content_type()
                 content_disposition = str(part.get("Content-Disposition", ""))
+                is_attachment = "attachment" in content_disposition
+                filename = part.get_filename()
 
-                # Skip attachments
-                if "attachment" in content_disposition:
+                if is_attachment or filename:
+                    if filename:
+                        # Content is decoded lazily on first read of EmailAttachment.content
+                        size = _decoded_size(part)
+                        if size:
+                            attachment = EmailAttachment(
+                                filename=self._decode_header_value(filename),
+                                content_type=content_type,
+                                size_bytes=size
+                            )
+                            attachment._source_part = part
+                            attachments.append(attachment)
+                    # Attachments never provide the body
+                    if is_attachment:
+                        continue
+
+                if content_type == "text/plain":
+                    if text_body:
+                        continue
+                elif content_type == "text/html":
+                    if html_body:
+                        continue
+                else:
                     continue
 
                 try:
                     payload = part.get_payload(decode=True)
                     if payload:
-                        charset = part.get_content_charset() or 'utf-8'
-                        decoded = payload.decode(charset, errors='replace')
+                        decoded = payload.decode(_codec_name(part.get_content_charset()), errors='replace')
                         
-                        if content_type == "text/plain" and not text_body:
+                        if content_type == "text/plain":
                             text_body = decoded
-                        elif content_type == "text/html" and not html_body:
+                        else:
                             html_body = decoded
                 except Exception as e:
                     logger.warning(f"Failed to decode email part: {e}")
@@ -161,8 +460,7 @@ class GmailIMAPClient:
             try:
                 payload = msg.get_payload(decode=True)
                 if payload:
-                    charset = msg.get_content_charset() or 'utf-8'
-                    decoded = payload.decode(charset, errors='replace')
+                    decoded = payload.decode(_codec_name(msg.get_content_charset()), errors='replace')
                     
                     if content_type == "text/plain":
                         text_body = decoded
@@ -174,42 +472,19 @@ class GmailIMAPClient:
         # Convert HTML to text if no text body
         if html_body and not text_body:
             try:
-                text_body = self._h2t.handle(html_body)
+                text_body = _html_to_text(html_body)
             except:
-                soup = BeautifulSoup(html_body, 'html.parser')
-                text_body = soup.get_text(separator='\n', strip=True)
-
-        return text_body, html_body
-
-    def _extract_attachments(self, msg: email.message.Message) -> List[EmailAttachment]:
-        """Extract attachments from email message."""
-        attachments = []
-
-        if not msg.is_multipart():
-            return attachments
-
-        for part in msg.walk():
-            content_disposition = str(part.get("Content-Disposition", ""))
-            
-            if "attachment" in content_disposition or part.get_filename():
-                filename = part.get_filename()
-                if filename:
-                    filename = self._decode_header_value(filename)
-                    content_type = part.get_content_type()
-                    payload = part.get_payload(decode=True)
-                    
-                    if payload:
-                        attachments.append(EmailAttachment(
-                            filename=filename,
-                            content_type=content_type,
-                            size_bytes=len(payload),
-                            content=payload
-                        ))
+                text_body = _strip_html(html_body)
 
-        return attachments
+        return text_body, html_body, attachments
 
-    def _parse_email(self, uid: int, raw_email: bytes) -> Optional[EmailMessage]:
-        """Parse raw email bytes into EmailMessage object."""
+    def _parse_email(
+        self,
+        uid: int,
+        raw_email: bytes,
+        headers_only: bool = False
+    ) -> Optional[EmailMessage]:
+        """Parse raw email bytes (or just its header block) into EmailMessage object."""
         try:
             msg = email.message_from_bytes(raw_email)
             
@@ -230,16 +505,16 @@ class GmailIMAPClient:
             cc = self._parse_email_addresses(msg.get("Cc"))
             bcc = self._parse_email_addresses(msg.get("Bcc"))
 
-            # Extract body
-            text_body, html_body = self._extract_body(msg)
-
-            # Extract attachments
-            attachments = self._extract_attachments(msg)
+            if headers_only:
+                text_body = html_body = None
+                attachments = []
+            else:
+                # Extract body and attachments
+                text_body, html_body, attachments = self._extract_parts(msg)
 
             # Threading headers
             in_reply_to = msg.get("In-Reply-To")
-            references_header = msg.get("References", "")
-            references = [ref.strip() for ref in references_header.split() if ref.strip()]
+            references = _MSGID_RE.findall(str(msg.get("References", "")))
 
             return EmailMessage(
                 message_id=message_id,
@@ -262,15 +537,26 @@ class GmailIMAPClient:
             return None
 
     def select_folder(self, folder: str = "INBOX") -> int:
-        """Select a mailbox folder. Returns message count."""
+        """
+        Select a mailbox folder. Returns message count.
+        
+        Selecting the folder that is already selected skips the SELECT
+        round trip and returns the count from when it was selected.
+        """
         if not self._connection:
             raise IMAPError("Not connected")
         
+        if folder == self._selected_folder:
+            return self._selected_count
+        
+        self._selected_folder = None
         status, data = self._connection.select(folder)
         if status != "OK":
             raise IMAPError(f"Failed to select folder {folder}")
         
-        return int(data[0])
+        self._selected_folder = folder
+        self._selected_count = int(data[0])
+        return self._selected_count
 
     def search(
         self,
@@ -293,7 +579,16 @@ class GmailIMAPClient:
         
         self.select_folder(folder)
         
-        status, data = self._connection.search(None, criteria)
+        # Servers with ESEARCH return the matches as a compact sequence set
+        if "ESEARCH" in self._connection.capabilities:
+            status, _ = self._connection.uid("SEARCH", "RETURN", "(ALL)", criteria)
+            if status != "OK":
+                raise IMAPError(f"Search failed: {criteria}")
+            _, data = self._connection.response("ESEARCH")
+            match = _ESEARCH_ALL_RE.search(data[0] or b"")
+            return _parse_sequence_set(match.group(1)) if match else []
+        
+        status, data = self._connection.uid("SEARCH", criteria)
         if status != "OK":
             raise IMAPError(f"Search failed: {criteria}")
         
@@ -303,36 +598,179 @@ class GmailIMAPClient:
     def fetch_emails(
         self,
         uids: List[int],
-        mark_as_read: bool = False
+        mark_as_read: bool = False,
+        fetch_mode: FetchMode = "full",
+        parse_workers: Optional[int] = None
     ) -> Generator[EmailMessage, None, None]:
-        """Fetch emails by UIDs."""
+        """
+        Fetch emails by UIDs, several messages per FETCH command.
+        
+        A full fetch marks the messages read on the server. With
+        fetch_mode="metadata" only the header block of each message is
+        transferred, flags are left alone, and the returned messages have
+        no body or attachments.
+        
+        With parse_workers, fetched batches are parsed in that many worker
+        processes while the following batches are fetched. Messages are
+        still yielded in the requested order.
+        """
         if not self._connection:
             raise IMAPError("Not connected")
         
-        for uid in uids:
-            try:
-                # Fetch email
-                status, data = self._connection.fetch(str(uid).encode(), "(RFC822)")
-                if status != "OK":
-                    logger.warning(f"Failed to fetch email UID {uid}")
+        fetch_items = _FETCH_ITEMS[fetch_mode]
+        headers_only = fetch_mode == "metadata"
+        executor = ProcessPoolExecutor(max_workers=parse_workers) if parse_workers else None
+        # Batches submitted to the workers, oldest first
+        pending: "deque[Future[List[EmailMessage]]]" = deque()
+        
+        try:
+            for start in range(0, len(uids), _FETCH_BATCH_SIZE):
+                batch = uids[start:start + _FETCH_BATCH_SIZE]
+                try:
+                    status, data = self._connection.uid("FETCH", _sequence_set(batch), fetch_items)
+                    if status != "OK":
+                        logger.warning(f"Failed to fetch emails {batch[0]}-{batch[-1]}")
+                        continue
+                except Exception as e:
+                    logger.error(f"Error fetching emails {batch[0]}-{batch[-1]}: {e}")
                     continue
                 
-                raw_email = data[0][1]
-                email_msg = self._parse_email(uid, raw_email)
+                if executor is None:
+                    yield from self._finish_batch(
+                        self._parse_batch(batch, _fetched_by_uid(data), headers_only), mark_as_read
+                    )
+                    continue
                 
-                if email_msg:
-                    if mark_as_read:
-                        self.mark_as_read(uid)
-                    yield email_msg
-                    
-            except Exception as e:
-                logger.error(f"Error fetching email UID {uid}: {e}")
+                pending.append(executor.submit(
+                    _parse_batch_in_worker, batch, _fetched_by_uid(data), headers_only
+                ))
+                # Keep every worker busy, but no more batches than that in memory
+                if len(pending) >= parse_workers:
+                    yield from self._finish_batch(pending.popleft().result(), mark_as_read)
+            
+            while pending:
+                yield from self._finish_batch(pending.popleft().result(), mark_as_read)
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+
+    def _finish_batch(self, messages: List[EmailMessage], mark_as_read: bool) -> List[EmailMessage]:
+        """Apply mark_as_read to a parsed batch with a single STORE."""
+        if mark_as_read and messages:
+            self._connection.uid(
+                "STORE", _sequence_set([msg.uid for msg in messages]), "+FLAGS", "\\Seen"
+            )
+        return messages
+
+    def _parse_batch(
+        self,
+        batch: List[int],
+        raw_by_uid: Dict[int, bytes],
+        headers_only: bool = False
+    ) -> List[EmailMessage]:
+        """Parse one fetched batch, in request order, skipping failures."""
+        messages = []
+        for uid in batch:
+            raw_email = raw_by_uid.get(uid)
+            if raw_email is None:
+                logger.warning(f"Failed to fetch email UID {uid}")
+                continue
+            email_msg = self._parse_email(uid, bytes(raw_email), headers_only)
+            if email_msg:
+                messages.append(email_msg)
+        return messages
+
+    async def fetch_emails_async(
+        self,
+        uids: List[int],
+        folder: str = "INBOX",
+        mark_as_read: bool = False,
+        fetch_mode: FetchMode = "full"
+    ) -> List[EmailMessage]:
+        """
+        Fetch emails by UIDs over an asyncio (aioimaplib) connection.
+        
+        Opens its own connection, independent of connect(). Each batch is
+        parsed in a worker thread while the next batch is being fetched,
+        so network waits and MIME parsing overlap. fetch_mode is as for
+        fetch_emails().
+        """
+        fetch_items = _FETCH_ITEMS[fetch_mode]
+        headers_only = fetch_mode == "metadata"
+        
+        if self.settings.imap_use_ssl:
+            client = aioimaplib.IMAP4_SSL(
+                host=self.settings.imap_server,
+                port=self.settings.imap_port,
+                ssl_context=_TLS_CONTEXT
+            )
+        else:
+            client = aioimaplib.IMAP4(host=self.settings.imap_server, port=self.settings.imap_port)
+        
+        await client.wait_hello_from_server()
+        response = await client.login(
+            self.settings.gmail_email,
+            self.settings.gmail_app_password.get_secret_value()
+        )
+        if response.result != "OK":
+            raise IMAPError(f"Authentication failed: {response.lines}")
+        
+        messages: List[EmailMessage] = []
+        
+        async def collect(parsing: "asyncio.Task[List[EmailMessage]]") -> None:
+            parsed = await parsing
+            if mark_as_read and parsed:
+                await client.uid(
+                    "store", _sequence_set([msg.uid for msg in parsed]).decode(), "+FLAGS", "(\\Seen)"
+                )
+            messages.extend(parsed)
+        
+        try:
+            response = await client.select(folder)
+            if response.result != "OK":
+                raise IMAPError(f"Failed to select folder {folder}")
+            
+            parsing = None
+            for start in range(0, len(uids), _FETCH_BATCH_SIZE):
+                batch = uids[start:start + _FETCH_BATCH_SIZE]
+                response = await client.uid("fetch", _sequence_set(batch).decode(), fetch_items)
+                if response.result != "OK":
+                    logger.warning(f"Failed to fetch emails {batch[0]}-{batch[-1]}")
+                    continue
+                
+                # Each announcing line is followed by the message literal; the
+                # UID is on the announcing line or on the line after the literal
+                raw_by_uid = {}
+                lines = response.lines
+                for i, line in enumerate(lines[:-1]):
+                    if not isinstance(line, bytes) or not _ASYNC_FETCH_LINE_RE.match(line):
+                        continue
+                    match = _UID_RE.search(line)
+                    if match is None and i + 2 < len(lines) and isinstance(lines[i + 2], bytes):
+                        match = _UID_RE.search(lines[i + 2])
+                    if match:
+                        raw_by_uid[int(match.group(1))] = lines[i + 1]
+                
+                if parsing:
+                    await collect(parsing)
+                parsing = asyncio.create_task(asyncio.to_thread(self._parse_batch, batch, raw_by_uid, headers_only))
+            
+            if parsing:
+                await collect(parsing)
+        finally:
+            try:
+                await client.logout()
+            except Exception:
+                pass
+        
+        return messages
 
     def fetch_unread(
         self,
         folder: str = "INBOX",
         limit: Optional[int] = None,
-        mark_as_read: bool = False
+        mark_as_read: bool = False,
+        fetch_mode: FetchMode = "full"
     ) -> List[EmailMessage]:
         """Fetch unread emails from folder."""
         uids = self.search("UNSEEN", folder)
@@ -340,12 +778,13 @@ class GmailIMAPClient:
         if limit:
             uids = uids[-limit:]  # Get most recent
         
-        return list(self.fetch_emails(uids, mark_as_read))
+        return list(self.fetch_emails(uids, mark_as_read, fetch_mode))
 
     def fetch_all(
         self,
         folder: str = "INBOX",
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        fetch_mode: FetchMode = "full"
     ) -> List[EmailMessage]:
         """Fetch all emails from folder."""
         uids = self.search("ALL", folder)
@@ -353,14 +792,14 @@ class GmailIMAPClient:
         if limit:
             uids = uids[-limit:]
         
-        return list(self.fetch_emails(uids))
+        return list(self.fetch_emails(uids, fetch_mode=fetch_mode))
 
     def mark_as_read(self, uid: int) -> bool:
         """Mark email as read."""
         if not self._connection:
             raise IMAPError("Not connected")
         
-        status, _ = self._connection.store(str(uid).encode(), "+FLAGS", "\\Seen")
+        status, _ = self._connection.uid("STORE", str(uid), "+FLAGS", "\\Seen")
         return status == "OK"
 
     def mark_as_unread(self, uid: int) -> bool:
@@ -368,7 +807,7 @@ class GmailIMAPClient:
         if not self._connection:
             raise IMAPError("Not connected")
         
-        status, _ = self._connection.store(str(uid).encode(), "-FLAGS", "\\Seen")
+        status, _ = self._connection.uid("STORE", str(uid), "-FLAGS", "\\Seen")
         return status == "OK"
 
     def move_to_folder(self, uid: int, destination: str) -> bool:
@@ -377,13 +816,15 @@ class GmailIMAPClient:
             raise IMAPError("Not connected")
         
         # Copy to destination
-        status, _ = self._connection.copy(str(uid).encode(), destination)
+        status, _ = self._connection.uid("COPY", str(uid), destination)
         if status != "OK":
             return False
         
         # Mark original as deleted
-        self._connection.store(str(uid).encode(), "+FLAGS", "\\Deleted")
+        self._connection.uid("STORE", str(uid), "+FLAGS", "\\Deleted")
         self._connection.expunge()
+        # The expunge changed the folder's message count
+        self._selected_folder = None
         
         return True
 
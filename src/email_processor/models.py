@@ -4,10 +4,20 @@ Data models for Email Processor Agent.
 Defines Pydantic models for emails, drafts, and analysis results.
 """
 
+import base64
 from datetime import datetime
+from email.message import Message
 from enum import Enum
-from typing import Optional, List
-from pydantic import BaseModel, Field, EmailStr
+from typing import Optional, List, Union
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, TypeAdapter, field_validator
+
+
+def _check_address(value: str) -> str:
+    """Cheap sanity check for an email address; the mail servers do the rest."""
+    local, _, domain = value.rpartition("@")
+    if not local or not domain or any(ch.isspace() or not ch.isprintable() for ch in value):
+        raise ValueError(f"not an email address: {value!r}")
+    return value
 
 
 class EmailPriority(str, Enum):
@@ -44,14 +54,50 @@ class EmailAttachment(BaseModel):
     filename: str
     content_type: str
     size_bytes: int
-    content: Optional[bytes] = Field(default=None, exclude=True)
+    
+    # Attachment bytes; read and set through the content property
+    _content: Optional[bytes] = PrivateAttr(default=None)
+    # MIME part that content is decoded from on first read
+    _source_part: Optional[Message] = PrivateAttr(default=None)
+    # Base64 transfer encoding of content, kept for re-sends
+    _encoded_b64: Optional[str] = PrivateAttr(default=None)
+
+    def __init__(self, content: Optional[bytes] = None, **data):
+        super().__init__(**data)
+        self._content = content
+
+    @property
+    def content(self) -> Optional[bytes]:
+        """Attachment bytes, decoded from the source MIME part on first read."""
+        if self._content is None and self._source_part is not None:
+            self._content = self._source_part.get_payload(decode=True)
+            self._source_part = None
+        return self._content
+
+    @content.setter
+    def content(self, value: Optional[bytes]) -> None:
+        self._content = value
+        self._source_part = None
+        self._encoded_b64 = None
+
+    def get_base64_payload(self) -> Optional[str]:
+        """Get the content base64-encoded for a MIME part, encoding it only once."""
+        if self._encoded_b64 is None:
+            content = self.content
+            if content is not None:
+                self._encoded_b64 = base64.encodebytes(content).decode("ascii")
+        return self._encoded_b64
 
 
 class EmailAddress(BaseModel):
     """Email address with optional display name."""
-    email: EmailStr
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    email: str
     name: Optional[str] = None
 
+    _check_email = field_validator("email")(_check_address)
+
     def __str__(self) -> str:
         if self.name:
             return f"{self.name} <{self.email}>"
@@ -86,10 +132,9 @@ class EmailMessage(BaseModel):
         """Get the best available body content."""
         return self.body_text or self.body_html or ""
 
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-        }
+    def to_json_bytes(self) -> bytes:
+        """Serialize to JSON bytes, without model_dump_json()'s str round trip."""
+        return _EMAIL_ADAPTER.dump_json(self)
 
 
 class EmailDraft(BaseModel):
@@ -141,7 +186,7 @@ class GenerationRequest(BaseModel):
     
     purpose: str = Field(..., description="Purpose of the email")
     recipient_name: Optional[str] = Field(default=None)
-    recipient_email: EmailStr = Field(..., description="Recipient email")
+    recipient_email: str = Field(..., description="Recipient email")
     context: Optional[str] = Field(default=None, description="Additional context")
     tone: str = Field(default="professional", description="Desired tone")
     key_points: List[str] = Field(default_factory=list, description="Points to include")
@@ -149,6 +194,8 @@ class GenerationRequest(BaseModel):
     include_signature: bool = Field(default=True)
     signature_name: Optional[str] = Field(default=None)
 
+    _check_recipient_email = field_validator("recipient_email")(_check_address)
+
 
 class ResponseRequest(BaseModel):
     """Request for generating a response to an email."""
@@ -158,3 +205,19 @@ class ResponseRequest(BaseModel):
     tone: str = Field(default="professional")
     include_original: bool = Field(default=True, description="Quote original email")
     additional_context: Optional[str] = Field(default=None)
+
+
+# Built once; constructing a TypeAdapter compiles its validator
+_EMAIL_ADAPTER = TypeAdapter(EmailMessage)
+_EMAIL_LIST_ADAPTER = TypeAdapter(List[EmailMessage])
+_ANALYSIS_LIST_ADAPTER = TypeAdapter(List[EmailAnalysis])
+
+
+def load_emails_json(data: Union[str, bytes]) -> List[EmailMessage]:
+    """Load a JSON array of emails, e.g. a saved mailbox snapshot."""
+    return _EMAIL_LIST_ADAPTER.validate_json(data)
+
+
+def load_analyses_json(data: Union[str, bytes]) -> List[EmailAnalysis]:
+    """Load a JSON array of analysis results."""
+    return _ANALYSIS_LIST_ADAPTER.validate_json(data)
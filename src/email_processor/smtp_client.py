@@ -5,26 +5,125 @@ Provides a robust SMTP client for sending emails through Gmail.
 """
 
 import logging
+import re
 import smtplib
+import ssl
+from itertools import chain
+from email.errors import HeaderParseError
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
-from email import encoders
 from email.utils import formataddr, formatdate, make_msgid
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from contextlib import contextmanager
 
 from email_processor.config import Settings
-from email_processor.models import EmailDraft, EmailPriority
+from email_processor.connection_pool import ConnectionPool
+from email_processor.models import EmailAddress, EmailDraft, EmailPriority
 
 logger = logging.getLogger(__name__)
 
 
+# One TLS context for every SMTP connection in the process
+_TLS_CONTEXT = ssl.create_default_context()
+
+# Attempts per send() when the server has dropped the connection
+_SEND_ATTEMPTS = 2
+
+# Headers set for each draft priority
+_PRIORITY_HEADERS: Dict[EmailPriority, Tuple[Tuple[str, str], ...]] = {
+    EmailPriority.LOW: (("X-Priority", "5"), ("Importance", "low")),
+    EmailPriority.NORMAL: (),
+    EmailPriority.HIGH: (("X-Priority", "1"), ("Importance", "high")),
+    EmailPriority.URGENT: (("X-Priority", "1"), ("Importance", "high"), ("X-MSMail-Priority", "High")),
+}
+
+# Display-name characters that formataddr() would quote (its specialsre)
+_NAME_SPECIALS_RE = re.compile(r'[][\\()<>@,:;".]')
+
+
 class SMTPError(Exception):
     """Custom exception for SMTP operations."""
     pass
 
 
+def _open_connection(settings: Settings) -> smtplib.SMTP:
+    """Open and authenticate a new SMTP connection."""
+    logger.info(f"Connecting to {settings.smtp_server}:{settings.smtp_port}")
+    
+    if settings.smtp_use_ssl:
+        # TLS from the first byte; no plaintext EHLO and STARTTLS round trip
+        connection = smtplib.SMTP_SSL(settings.smtp_server, settings.smtp_port, context=_TLS_CONTEXT)
+    else:
+        connection = smtplib.SMTP(settings.smtp_server, settings.smtp_port)
+        
+        # Start TLS if configured
+        if settings.smtp_use_tls:
+            connection.starttls(context=_TLS_CONTEXT)
+    
+    # Authenticate
+    connection.login(settings.gmail_email, settings.gmail_app_password.get_secret_value())
+    logger.info("Successfully authenticated with Gmail SMTP")
+    return connection
+
+
+def _format_address(addr: EmailAddress) -> str:
+    """Format an address for a To/Cc header."""
+    if not addr.name:
+        return addr.email
+    if addr.name.isascii() and not _NAME_SPECIALS_RE.search(addr.name):
+        # Nothing to quote or encode
+        return f"{addr.name} <{addr.email}>"
+    # Quote specials and RFC 2047-encode non-ASCII names
+    return formataddr((addr.name, addr.email))
+
+
+def _format_addr_list(addrs: List[EmailAddress]) -> str:
+    """Format addresses for a To/Cc header."""
+    if len(addrs) == 1:
+        # The usual case; no join needed
+        return _format_address(addrs[0])
+    return ", ".join([_format_address(addr) for addr in addrs])
+
+
+def _quit_quietly(connection: smtplib.SMTP) -> None:
+    """Quit, ignoring errors from a connection that is already gone."""
+    try:
+        connection.quit()
+        logger.info("Disconnected from SMTP server")
+    except:
+        pass
+
+
+class SMTPPool(ConnectionPool[smtplib.SMTP]):
+    """
+    Pool of authenticated SMTP connections, reused across connect() calls.
+    
+    Idle connections are kept per (server, port, account). SMTP servers
+    close idle sessions after a few minutes, so a connection idle for
+    longer than idle_timeout is quit rather than reused, and any other
+    is checked with a NOOP before it is handed out.
+    """
+
+    def __init__(self, max_idle: int = 4, idle_timeout: float = 120.0):
+        super().__init__(max_idle, idle_timeout)
+
+    def _key(self, settings: Settings) -> Tuple[str, int, str]:
+        return settings.smtp_server, settings.smtp_port, settings.gmail_email
+
+    def _open(self, settings: Settings) -> smtplib.SMTP:
+        return _open_connection(settings)
+
+    def _is_alive(self, connection: smtplib.SMTP) -> bool:
+        try:
+            return connection.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _close(self, connection: smtplib.SMTP) -> None:
+        _quit_quietly(connection)
+
+
 class GmailSMTPClient:
     """
     Gmail SMTP client for sending emails.
@@ -36,34 +135,31 @@ class GmailSMTPClient:
     - Priority settings
     """
 
-    def __init__(self, settings: Settings):
-        """Initialize the SMTP client with settings."""
+    def __init__(self, settings: Settings, pool: Optional[SMTPPool] = None):
+        """
+        Initialize the SMTP client with settings.
+        
+        With a pool, connect() borrows an authenticated connection from it
+        and hands it back afterwards instead of logging in and quitting.
+        """
         self.settings = settings
+        self.pool = pool
         self._connection: Optional[smtplib.SMTP] = None
+        # Message-ID domain; make_msgid() would otherwise call getfqdn() per message
+        self._msgid_domain = settings.gmail_email.rpartition("@")[2]
 
     @contextmanager
     def connect(self):
         """Context manager for SMTP connection."""
+        reusable = False
         try:
-            logger.info(f"Connecting to {self.settings.smtp_server}:{self.settings.smtp_port}")
-            
-            self._connection = smtplib.SMTP(
-                self.settings.smtp_server,
-                self.settings.smtp_port
-            )
-            
-            # Start TLS if configured
-            if self.settings.smtp_use_tls:
-                self._connection.starttls()
-            
-            # Authenticate
-            self._connection.login(
-                self.settings.gmail_email,
-                self.settings.gmail_app_password.get_secret_value()
-            )
-            logger.info("Successfully authenticated with Gmail SMTP")
+            if self.pool:
+                self._connection = self.pool.acquire(self.settings)
+            else:
+                self._connection = _open_connection(self.settings)
             
             yield self
+            reusable = True
             
         except smtplib.SMTPAuthenticationError as e:
             logger.error(f"SMTP authentication failed: {e}")
@@ -73,11 +169,11 @@ class GmailSMTPClient:
             raise SMTPError(f"Connection failed: {e}")
         finally:
             if self._connection:
-                try:
-                    self._connection.quit()
-                    logger.info("Disconnected from SMTP server")
-                except:
-                    pass
+                if self.pool:
+                    # A connection that saw an error may be mid-transaction; drop it
+                    self.pool.release(self.settings, self._connection, reusable)
+                else:
+                    _quit_quietly(self._connection)
                 self._connection = None
 
     def _create_message(self, draft: EmailDraft) -> MIMEMultipart:
@@ -98,26 +194,18 @@ class GmailSMTPClient:
 
         # Set headers
         msg["From"] = self.settings.gmail_email
-        msg["To"] = ", ".join(str(addr) for addr in draft.to)
+        msg["To"] = _format_addr_list(draft.to)
         
         if draft.cc:
-            msg["Cc"] = ", ".join(str(addr) for addr in draft.cc)
+            msg["Cc"] = _format_addr_list(draft.cc)
         
         msg["Subject"] = draft.subject
         msg["Date"] = formatdate(localtime=True)
-        msg["Message-ID"] = make_msgid()
+        msg["Message-ID"] = make_msgid(domain=self._msgid_domain)
 
         # Set priority
-        if draft.priority == EmailPriority.HIGH:
-            msg["X-Priority"] = "1"
-            msg["Importance"] = "high"
-        elif draft.priority == EmailPriority.URGENT:
-            msg["X-Priority"] = "1"
-            msg["Importance"] = "high"
-            msg["X-MSMail-Priority"] = "High"
-        elif draft.priority == EmailPriority.LOW:
-            msg["X-Priority"] = "5"
-            msg["Importance"] = "low"
+        for name, value in _PRIORITY_HEADERS[draft.priority]:
+            msg[name] = value
 
         # Threading headers for replies
         if draft.in_reply_to:
@@ -144,8 +232,9 @@ class GmailSMTPClient:
         for attachment in draft.attachments:
             if attachment.content:
                 part = MIMEBase("application", "octet-stream")
-                part.set_payload(attachment.content)
-                encoders.encode_base64(part)
+                # Same encoding encoders.encode_base64() does, cached on the attachment
+                part.set_payload(attachment.get_base64_payload())
+                part["Content-Transfer-Encoding"] = "base64"
                 part.add_header(
                     "Content-Disposition",
                     f"attachment; filename={attachment.filename}"
@@ -165,21 +254,32 @@ class GmailSMTPClient:
 
         msg = self._create_message(draft)
         
-        # Collect all recipients
-        recipients = [str(addr.email) for addr in draft.to]
-        recipients.extend(str(addr.email) for addr in draft.cc)
-        recipients.extend(str(addr.email) for addr in draft.bcc)
+        # Collect all recipients; built once, a retry sends to the same list
+        recipients = [addr.email for addr in chain(draft.to, draft.cc, draft.bcc)]
 
         try:
-            self._connection.sendmail(
-                self.settings.gmail_email,
-                recipients,
-                msg.as_string()
-            )
+            for attempt in range(_SEND_ATTEMPTS):
+                try:
+                    # Flattens straight to bytes, skipping the as_string()
+                    # copy that sendmail() would then encode again
+                    self._connection.send_message(
+                        msg,
+                        from_addr=self.settings.gmail_email,
+                        to_addrs=recipients
+                    )
+                    break
+                except smtplib.SMTPServerDisconnected:
+                    # Typically a pooled connection the server timed out
+                    if attempt + 1 == _SEND_ATTEMPTS:
+                        raise
+                    logger.info("SMTP connection dropped, reconnecting")
+                    _quit_quietly(self._connection)
+                    self._connection = _open_connection(self.settings)
             
             message_id = msg["Message-ID"]
             logger.info(f"Email sent successfully: {message_id}")
-            logger.info(f"  To: {', '.join(str(addr) for addr in draft.to)}")
+            # Reuse the header built in _create_message()
+            logger.info(f"  To: {msg['To']}")
             logger.info(f"  Subject: {draft.subject}")
             
             return message_id
@@ -188,6 +288,33 @@ class GmailSMTPClient:
             logger.error(f"Failed to send email: {e}")
             raise SMTPError(f"Send failed: {e}")
 
+    def send_batch(self, drafts: Iterable[EmailDraft]) -> List[Optional[str]]:
+        """
+        Send several drafts over the current connection.
+        
+        A failed draft does not stop the batch; the SMTP session is reset
+        and sending carries on. Returns the message IDs in draft order,
+        with None for drafts that failed.
+        """
+        if not self._connection:
+            raise SMTPError("Not connected")
+
+        message_ids: List[Optional[str]] = []
+        for draft in drafts:
+            try:
+                message_ids.append(self.send(draft))
+            except (SMTPError, HeaderParseError, ValueError, OSError) as e:
+                # A draft whose headers will not serialize, or a dropped socket
+                logger.error(f"Failed to send draft {draft.subject!r}: {e}")
+                message_ids.append(None)
+                # Leave no half-finished transaction for the next draft
+                try:
+                    self._connection.rset()
+                except (smtplib.SMTPException, OSError):
+                    pass
+        
+        return message_ids
+
     def send_simple(
         self,
         to: str,
@@ -196,8 +323,6 @@ class GmailSMTPClient:
         html_body: Optional[str] = None
     ) -> str:
         """Send a simple email without creating a draft object."""
-        from email_processor.models import EmailAddress
-        
         draft = EmailDraft(
             to=[EmailAddress(email=to)],
             subject=subject,
@@ -0,0 +1,204 @@
+"""Tests for the pooled IMAP and SMTP connections."""
+
+import imaplib
+import smtplib
+from types import SimpleNamespace
+
+import pytest
+
+from email_processor import connection_pool, imap_client, smtp_client
+from email_processor.imap_client import GmailIMAPClient, IMAPError, IMAPPool
+from email_processor.smtp_client import GmailSMTPClient, SMTPError, SMTPPool
+
+
+SETTINGS = SimpleNamespace(
+    imap_server="imap.example.com",
+    imap_port=993,
+    smtp_server="smtp.example.com",
+    smtp_port=587,
+    gmail_email="me@x.com",
+)
+
+
+class FakeIMAPConnection:
+    """Stands in for an authenticated imaplib.IMAP4."""
+
+    def __init__(self, alive=True):
+        self.alive = alive
+        self.logged_out = False
+
+    def noop(self):
+        if not self.alive:
+            raise imaplib.IMAP4.abort("connection closed")
+        return "OK", [b"NOOP completed"]
+
+    def logout(self):
+        self.logged_out = True
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    """Connections opened by the IMAP pool, in order."""
+    connections = []
+
+    def open_connection(settings):
+        connections.append(FakeIMAPConnection())
+        return connections[-1]
+
+    monkeypatch.setattr(imap_client, "_open_connection", open_connection)
+    return connections
+
+
+@pytest.fixture
+def imap_pool():
+    pool = IMAPPool(max_idle=2, keepalive_interval=3600)
+    yield pool
+    pool.close()
+
+
+def test_imap_pool_reuses_released_connection(imap_pool, opened):
+    connection = imap_pool.acquire(SETTINGS)
+    imap_pool.release(SETTINGS, connection)
+
+    assert imap_pool.acquire(SETTINGS) is connection
+    assert len(opened) == 1
+
+
+def test_imap_pool_replaces_dead_connection(imap_pool, opened):
+    stale = imap_pool.acquire(SETTINGS)
+    imap_pool.release(SETTINGS, stale)
+    stale.alive = False
+
+    connection = imap_pool.acquire(SETTINGS)
+
+    assert connection is not stale
+    assert stale.logged_out
+    assert len(opened) == 2
+
+
+def test_imap_pool_logs_out_beyond_max_idle(imap_pool, opened):
+    connections = [imap_pool.acquire(SETTINGS) for _ in range(3)]
+    for connection in connections:
+        imap_pool.release(SETTINGS, connection)
+
+    assert [connection.logged_out for connection in connections] == [False, False, True]
+
+
+def test_imap_pool_keeps_accounts_apart(imap_pool, opened):
+    connection = imap_pool.acquire(SETTINGS)
+    imap_pool.release(SETTINGS, connection)
+    other = SimpleNamespace(**{**vars(SETTINGS), "gmail_email": "you@x.com"})
+
+    assert imap_pool.acquire(other) is not connection
+
+
+def test_imap_connect_discards_connection_after_error(imap_pool, opened):
+    client = GmailIMAPClient(SETTINGS, pool=imap_pool)
+
+    with pytest.raises(IMAPError):
+        with client.connect():
+            raise RuntimeError("failed mid-command")
+
+    assert opened[0].logged_out
+    assert imap_pool.acquire(SETTINGS) is not opened[0]
+
+
+def test_imap_pool_close_logs_out_idle_connections(opened):
+    pool = IMAPPool(keepalive_interval=3600)
+    connection = pool.acquire(SETTINGS)
+    pool.release(SETTINGS, connection)
+    assert pool._timer is not None
+
+    pool.close()
+
+    assert connection.logged_out
+    assert pool._timer is None
+
+
+class FakeSMTPConnection:
+    """Stands in for an authenticated smtplib.SMTP."""
+
+    def __init__(self):
+        self.noop_code = 250
+        self.quit_called = False
+
+    def noop(self):
+        if self.noop_code is None:
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        return self.noop_code, b"OK"
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def smtp_opened(monkeypatch):
+    """Connections opened by the SMTP pool, in order."""
+    connections = []
+
+    def open_connection(settings):
+        connections.append(FakeSMTPConnection())
+        return connections[-1]
+
+    monkeypatch.setattr(smtp_client, "_open_connection", open_connection)
+    return connections
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(connection_pool.time, "monotonic", lambda: now.value)
+    return now
+
+
+def test_smtp_pool_reuses_connection_within_idle_timeout(smtp_opened, clock):
+    pool = SMTPPool(idle_timeout=120)
+    connection = pool.acquire(SETTINGS)
+    pool.release(SETTINGS, connection)
+    clock.value += 60
+
+    assert pool.acquire(SETTINGS) is connection
+    assert len(smtp_opened) == 1
+
+
+def test_smtp_pool_quits_connection_past_idle_timeout(smtp_opened, clock):
+    pool = SMTPPool(idle_timeout=120)
+    stale = pool.acquire(SETTINGS)
+    pool.release(SETTINGS, stale)
+    clock.value += 121
+
+    assert pool.acquire(SETTINGS) is not stale
+    assert stale.quit_called
+
+
+@pytest.mark.parametrize("noop_code", [421, None])
+def test_smtp_pool_replaces_connection_failing_noop(smtp_opened, noop_code):
+    pool = SMTPPool()
+    stale = pool.acquire(SETTINGS)
+    pool.release(SETTINGS, stale)
+    stale.noop_code = noop_code
+
+    assert pool.acquire(SETTINGS) is not stale
+    assert stale.quit_called
+
+
+def test_smtp_pool_quits_beyond_max_idle(smtp_opened):
+    pool = SMTPPool(max_idle=1)
+    first, second = pool.acquire(SETTINGS), pool.acquire(SETTINGS)
+    pool.release(SETTINGS, first)
+    pool.release(SETTINGS, second)
+
+    assert not first.quit_called
+    assert second.quit_called
+
+
+def test_smtp_connect_discards_connection_after_error(smtp_opened):
+    pool = SMTPPool()
+    client = GmailSMTPClient(SETTINGS, pool=pool)
+
+    with pytest.raises(SMTPError):
+        with client.connect():
+            raise smtplib.SMTPDataError(451, b"try again")
+
+    assert smtp_opened[0].quit_called
+    assert pool.acquire(SETTINGS) is not smtp_opened[0]
@@ -0,0 +1,53 @@
+"""Tests for the email template renderer."""
+
+import io
+
+from email_processor.email_templates import EmailTemplateRenderer
+
+
+def test_discrepancy_email_renders_non_str_values():
+    renderer = EmailTemplateRenderer()
+
+    html, plain = renderer.render_discrepancy_email(
+        vendor_name="Acme <Ltd>",
+        intro_message="Please review",
+        discrepancies=[{"title": "Quantity", "details": 5}],
+        key_points=[1, 2],
+    )
+
+    assert "<li>1</li>" in html and "<li>2</li>" in html
+    assert "5" in html
+    assert "Acme &lt;Ltd&gt;" in html
+    assert "5" in plain and "1" in plain
+
+
+def test_discrepancy_email_to_writer_renders_non_str_values():
+    renderer = EmailTemplateRenderer()
+    writer = io.StringIO()
+
+    plain = renderer.render_discrepancy_email_to(
+        writer,
+        vendor_name="Acme",
+        intro_message="Please review",
+        discrepancies=[{"title": 7, "details": 5.5}],
+        key_points=[3],
+    )
+
+    assert "5.5" in writer.getvalue() and "<li>3</li>" in writer.getvalue()
+    assert "5.5" in plain
+
+
+def test_regular_email_renders_non_str_values():
+    renderer = EmailTemplateRenderer()
+
+    html, plain = renderer.render_regular_email(
+        vendor_name="Acme",
+        intro_message="Hello",
+        key_points=[1, 2.5],
+        additional_info=42,
+        followup_message=7,
+    )
+
+    assert "<li>1</li>" in html and "<li>2.5</li>" in html
+    assert "42" in html
+    assert "2.5" in plain
@@ -0,0 +1,215 @@
+"""Tests for the Gmail IMAP client."""
+
+import asyncio
+import os
+from email.mime.application import MIMEApplication
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from types import SimpleNamespace
+
+import aioimaplib
+import pytest
+
+from email_processor.imap_client import (
+    GmailIMAPClient,
+    _decoded_size,
+    _fetched_by_uid,
+    _parse_sequence_set,
+    _sequence_set,
+)
+
+
+def test_parse_email_decodes_raw_8bit_subject():
+    # compat32 hands back an email.header.Header for raw 8-bit headers
+    raw = "From: a@x.com\r\nTo: b@x.com\r\nSubject: Café\r\n\r\nhi\r\n".encode()
+
+    message = GmailIMAPClient(None)._parse_email(1, raw)
+
+    assert message is not None
+    assert message.subject == "Café"
+
+
+def test_parse_email_decodes_encoded_word_subject():
+    raw = b"From: a@x.com\r\nSubject: =?utf-8?q?Caf=C3=A9?=\r\n\r\nhi\r\n"
+
+    message = GmailIMAPClient(None)._parse_email(1, raw)
+
+    assert message.subject == "Café"
+
+
+class FakeAsyncIMAP:
+    """Stands in for aioimaplib.IMAP4, with the same public method signatures."""
+
+    def __init__(self, messages, **kwargs):
+        self.messages = messages
+        self.commands = []
+
+    async def wait_hello_from_server(self):
+        pass
+
+    async def login(self, user, password):
+        return aioimaplib.Response("OK", [b"LOGIN completed"])
+
+    async def select(self, mailbox="INBOX"):
+        return aioimaplib.Response("OK", [b"SELECT completed"])
+
+    async def fetch(self, message_set, message_parts):
+        raise AssertionError("sequence-number FETCH used instead of UID FETCH")
+
+    async def store(self, *criteria):
+        raise AssertionError("sequence-number STORE used instead of UID STORE")
+
+    async def uid(self, command, *criteria):
+        self.commands.append((command, *criteria))
+        if command == "fetch":
+            lines = []
+            for n, uid in enumerate(_parse_sequence_set(criteria[0].encode()), 1):
+                raw = self.messages[uid]
+                lines += [f"{n} FETCH (UID {uid} RFC822 {{{len(raw)}}}".encode(), raw, b")"]
+            return aioimaplib.Response("OK", lines + [b"FETCH completed"])
+        return aioimaplib.Response("OK", [b"STORE completed"])
+
+    async def logout(self):
+        pass
+
+
+def test_fetch_emails_async_uses_uid_commands(monkeypatch):
+    messages = {
+        uid: f"From: a@x.com\r\nSubject: Hi {uid}\r\n\r\nbody\r\n".encode()
+        for uid in (1001, 1002, 1005)
+    }
+    fake = FakeAsyncIMAP(messages)
+    monkeypatch.setattr(aioimaplib, "IMAP4", lambda **kwargs: fake)
+    settings = SimpleNamespace(
+        imap_use_ssl=False,
+        imap_server="imap.example.com",
+        imap_port=143,
+        gmail_email="me@x.com",
+        gmail_app_password=SimpleNamespace(get_secret_value=lambda: "secret"),
+    )
+
+    fetched = asyncio.run(
+        GmailIMAPClient(settings).fetch_emails_async([1001, 1002, 1005], mark_as_read=True)
+    )
+
+    assert [(msg.uid, msg.subject) for msg in fetched] == [
+        (1001, "Hi 1001"), (1002, "Hi 1002"), (1005, "Hi 1005")
+    ]
+    assert fake.commands == [
+        ("fetch", "1001:1002,1005", "(UID RFC822)"),
+        ("store", "1001:1002,1005", "+FLAGS", "(\\Seen)"),
+    ]
+
+
+@pytest.mark.parametrize("numbers, expected", [
+    ([1, 2, 3, 7], b"1:3,7"),
+    ([5], b"5"),
+    ([9, 1, 3, 2, 10, 7], b"1:3,7,9:10"),
+    ([4, 4, 5], b"4:5"),
+    ([], b""),
+])
+def test_sequence_set_compresses_runs(numbers, expected):
+    assert _sequence_set(numbers) == expected
+
+
+@pytest.mark.parametrize("sequence_set, expected", [
+    (b"1:3,7", [1, 2, 3, 7]),
+    (b"9", [9]),
+    (b"5:3", [3, 4, 5]),
+])
+def test_parse_sequence_set_expands_ranges(sequence_set, expected):
+    assert _parse_sequence_set(sequence_set) == expected
+
+
+def test_fetched_by_uid_maps_out_of_order_literals():
+    data = [
+        (b"2 (UID 1005 RFC822 {3}", b"two"),
+        b")",
+        (b"1 (RFC822 {3}", b"one"),
+        b" UID 1001)",
+    ]
+
+    assert _fetched_by_uid(data) == {1005: b"two", 1001: b"one"}
+
+
+class FakeIMAP:
+    """Stands in for an authenticated imaplib.IMAP4 connection."""
+
+    def __init__(self, messages, capabilities=("IMAP4REV1",)):
+        self.messages = messages
+        self.capabilities = capabilities
+        self.commands = []
+
+    def select(self, mailbox="INBOX"):
+        return "OK", [str(len(self.messages)).encode()]
+
+    def uid(self, command, *args):
+        self.commands.append((command, *args))
+        if command == "SEARCH":
+            return "OK", [b" ".join(str(uid).encode() for uid in self.messages)]
+        if command == "FETCH":
+            # Answer in reverse order to check the UID matching
+            data = []
+            for n, uid in enumerate(reversed(_parse_sequence_set(args[0])), 1):
+                raw = self.messages[uid]
+                data += [(f"{n} (UID {uid} RFC822 {{{len(raw)}}}".encode(), raw), b")"]
+            return "OK", data
+        return "OK", [None]
+
+    def response(self, code):
+        return code, [b'(TAG "A5") UID ALL 1:3,7']
+
+
+def test_search_expands_esearch_result():
+    client = GmailIMAPClient(None)
+    client._connection = FakeIMAP({}, capabilities=("IMAP4REV1", "ESEARCH"))
+
+    assert client.search("ALL") == [1, 2, 3, 7]
+    assert client._connection.commands == [("SEARCH", "RETURN", "(ALL)", "ALL")]
+
+
+def test_fetch_emails_batches_and_keeps_request_order():
+    uids = list(range(1001, 1121))
+    messages = {uid: f"From: a@x.com\r\nSubject: Hi {uid}\r\n\r\nbody\r\n".encode() for uid in uids}
+    client = GmailIMAPClient(None)
+    client._connection = FakeIMAP(messages)
+
+    fetched = list(client.fetch_emails(uids))
+
+    assert [msg.uid for msg in fetched] == uids
+    assert [msg.subject for msg in fetched[:2]] == ["Hi 1001", "Hi 1002"]
+    assert [command[1] for command in client._connection.commands] == [
+        b"1001:1050", b"1051:1100", b"1101:1120"
+    ]
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 4, 57, 58, 1000, 4099])
+def test_decoded_size_matches_base64_payload(size):
+    part = MIMEApplication(os.urandom(size))
+
+    assert _decoded_size(part) == len(part.get_payload(decode=True))
+
+
+def test_decoded_size_of_non_base64_part():
+    part = MIMEText("caf\u00e9 " * 40, "plain", "utf-8")
+    part.replace_header("Content-Transfer-Encoding", "quoted-printable")
+    part.set_payload("caf=C3=A9 " * 40)
+
+    assert _decoded_size(part) == len(part.get_payload(decode=True))
+
+
+def test_parse_email_attachment_content_is_decoded_on_read():
+    msg = MIMEMultipart()
+    msg["From"] = "a@x.com"
+    msg.attach(MIMEText("see attached"))
+    data = os.urandom(300)
+    attachment = MIMEApplication(data)
+    attachment.add_header("Content-Disposition", "attachment", filename="report.bin")
+    msg.attach(attachment)
+
+    message = GmailIMAPClient(None)._parse_email(1, msg.as_bytes())
+
+    [fetched] = message.attachments
+    assert fetched.filename == "report.bin"
+    assert fetched.size_bytes == len(data)
+    assert fetched.content == data
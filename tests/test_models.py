@@ -0,0 +1,66 @@
+"""Tests for the data models."""
+
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+
+from email_processor.models import EmailAddress, EmailAttachment, EmailMessage
+
+
+def make_attachment(**kwargs):
+    return EmailAttachment(filename="a.txt", content_type="text/plain", size_bytes=3, **kwargs)
+
+
+def test_attachment_keeps_content_passed_in():
+    attachment = make_attachment(content=b"abc")
+
+    assert attachment.content == b"abc"
+    assert "content" not in attachment.model_dump()
+
+
+def test_attachment_content_can_be_replaced():
+    attachment = make_attachment()
+    assert attachment.content is None
+
+    attachment.content = b"xyz"
+
+    assert attachment.content == b"xyz"
+
+
+def test_attachment_base64_payload_follows_new_content():
+    attachment = make_attachment(content=b"old")
+    assert attachment.get_base64_payload() == "b2xk\n"
+
+    attachment.content = b"new"
+
+    assert attachment.get_base64_payload() == "bmV3\n"
+
+
+@pytest.mark.parametrize("email", ["a@x.com", "first.last+tag@mail.example.org", '"a@b"@x.com'])
+def test_email_address_accepts_valid_addresses(email):
+    assert EmailAddress(email=email).email == email
+
+
+@pytest.mark.parametrize("email", [
+    "nobody", "@x.com", "a@", "a b@x.com", "a@x.com\r\nBcc: c@y.com", "a@x.com\x00", "\ta@x.com",
+])
+def test_email_address_rejects_malformed_addresses(email):
+    with pytest.raises(ValidationError):
+        EmailAddress(email=email)
+
+
+def test_email_message_flags_can_be_updated():
+    message = EmailMessage(
+        message_id="<1@x.com>", uid=1, sender=EmailAddress(email="a@x.com"), date=datetime(2024, 1, 1)
+    )
+
+    message.is_read = True
+    message.labels.append("Processed")
+
+    assert message.is_read
+    assert message.labels == ["Processed"]
+
+
+def test_email_address_is_hashable():
+    assert len({EmailAddress(email="a@x.com"), EmailAddress(email="a@x.com")}) == 1
@@ -0,0 +1,47 @@
+"""Tests for the Gmail SMTP client."""
+
+from email.generator import BytesGenerator
+from io import BytesIO
+from types import SimpleNamespace
+
+from email_processor import smtp_client
+from email_processor.models import EmailAddress, EmailDraft
+from email_processor.smtp_client import GmailSMTPClient
+
+
+class FakeSMTP:
+    """Stands in for an authenticated smtplib.SMTP."""
+
+    def __init__(self):
+        self.commands = []
+
+    def send_message(self, msg, from_addr=None, to_addrs=None):
+        # Flatten like smtplib does, so header errors surface here
+        BytesGenerator(BytesIO()).flatten(msg)
+        self.commands.append(("send_message", msg["Subject"]))
+
+    def rset(self):
+        self.commands.append(("rset",))
+
+    def quit(self):
+        self.commands.append(("quit",))
+
+
+def make_draft(subject):
+    return EmailDraft(to=[EmailAddress(email="a@x.com")], subject=subject, body_text="body")
+
+
+def test_send_batch_carries_on_after_a_failing_draft(monkeypatch):
+    connection = FakeSMTP()
+    monkeypatch.setattr(smtp_client, "_open_connection", lambda settings: connection)
+    client = GmailSMTPClient(SimpleNamespace(gmail_email="me@x.com"))
+    drafts = [make_draft("first"), make_draft("bad\r\nBcc: x@y.com"), make_draft("third")]
+
+    with client.connect():
+        message_ids = client.send_batch(drafts)
+
+    assert message_ids[0] and message_ids[2]
+    assert message_ids[1] is None
+    assert connection.commands == [
+        ("send_message", "first"), ("rset",), ("send_message", "third"), ("quit",)
+    ]